@@ -0,0 +1,10 @@
+-- Adds the datetime index and the stored event_date column used by the
+-- daily GROUP BY queries. db.create_all() does not alter existing tables,
+-- so run this once against an existing `capstone` database.
+
+ALTER TABLE `sensor_data`
+  ADD COLUMN `event_date` date GENERATED ALWAYS AS (cast(`datetime` as date)) STORED;
+
+ALTER TABLE `sensor_data`
+  ADD KEY `ix_sensor_datetime` (`datetime`),
+  ADD KEY `ix_sensor_data_event_date` (`event_date`);
@@ -0,0 +1,8 @@
+-- Shrinks sensor_data.steps from INT (4 bytes) to SMALLINT UNSIGNED (2 bytes).
+-- Each log holds the steps counted since the previous reading, well below 65535;
+-- /add-log and /api/v1/add-logs reject values outside 0..65535 with a 400.
+-- Check first that no row is out of range:
+--   SELECT COUNT(*) FROM `sensor_data` WHERE `steps` < 0 OR `steps` > 65535;
+
+ALTER TABLE `sensor_data`
+  MODIFY `steps` smallint(5) UNSIGNED DEFAULT NULL;
@@ -0,0 +1,25 @@
+-- Per-day running totals of sensor_data, read by the dashboard summary table and charts.
+-- The app keeps it current on /add-log and /api/v1/add-logs; this script creates it and
+-- backfills existing logs (same as `flask --app server rebuild-daily-summary`).
+
+CREATE TABLE IF NOT EXISTS `daily_summary` (
+  `date` date NOT NULL,
+  `total_steps` bigint(20) NOT NULL DEFAULT 0,
+  `total_voltage` double NOT NULL DEFAULT 0,
+  `total_current` double NOT NULL DEFAULT 0,
+  `voltage_count` int(11) NOT NULL DEFAULT 0,
+  `current_count` int(11) NOT NULL DEFAULT 0,
+  `log_count` int(11) NOT NULL DEFAULT 0,
+  PRIMARY KEY (`date`)
+) ENGINE=InnoDB DEFAULT CHARSET=utf8mb4 COLLATE=utf8mb4_general_ci;
+
+INSERT INTO `daily_summary`
+  (`date`, `total_steps`, `total_voltage`, `total_current`, `voltage_count`, `current_count`, `log_count`)
+SELECT `event_date`, COALESCE(SUM(`steps`), 0), COALESCE(SUM(`raw_voltage`), 0), COALESCE(SUM(`raw_current`), 0),
+       COUNT(`raw_voltage`), COUNT(`raw_current`), COUNT(*)
+FROM `sensor_data`
+GROUP BY `event_date`
+ON DUPLICATE KEY UPDATE
+  `total_steps` = VALUES(`total_steps`), `total_voltage` = VALUES(`total_voltage`),
+  `total_current` = VALUES(`total_current`), `voltage_count` = VALUES(`voltage_count`),
+  `current_count` = VALUES(`current_count`), `log_count` = VALUES(`log_count`);
@@ -0,0 +1,12 @@
+-- Covering index for /api/v1/battery-health, which reads the newest row with a
+-- battery_health value (WHERE battery_health IS NOT NULL ORDER BY datetime DESC LIMIT 1).
+-- MariaDB walks this index backwards and checks battery_health without touching the rows,
+-- even when most recent logs were posted without a battery reading.
+-- Its leading (`datetime`, `id`) columns also serve every range filter and the log pages'
+-- ORDER BY datetime DESC, id DESC (and the keyset seek), so it replaces `ix_sensor_datetime`
+-- from 001 instead of making each insert maintain both. `id` must come before
+-- `battery_health`, or that ordering would need a filesort.
+
+ALTER TABLE `sensor_data`
+  ADD KEY `ix_sensor_datetime_id_battery` (`datetime`, `id`, `battery_health`),
+  DROP KEY `ix_sensor_datetime`;
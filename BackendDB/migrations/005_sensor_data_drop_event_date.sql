@@ -0,0 +1,8 @@
+-- Drops the stored event_date column (and its index) added in 001. The daily GROUP BYs
+-- it served now read daily_summary, and only the occasional rebuild (003, or
+-- `flask --app server rebuild-daily-summary`) groups sensor_data by day, using DATE(`datetime`).
+-- Without it, inserts no longer compute a generated column or update a second index.
+
+ALTER TABLE `sensor_data`
+  DROP KEY `ix_sensor_data_event_date`,
+  DROP COLUMN `event_date`;
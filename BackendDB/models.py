@@ -2,29 +2,63 @@
 
 # Import the SQLAlchemy extension for Flask
 from flask_sqlalchemy import SQLAlchemy
+from flask_sqlalchemy.session import Session
+from flask_bcrypt import Bcrypt
+from sqlalchemy import event
+from sqlalchemy.dialects import mysql
 
-# Initialize the SQLAlchemy database instance
-db = SQLAlchemy()
+# Session that sends plain SELECTs to the 'replica' bind when one is configured
+# (SQLALCHEMY_REPLICA_URI in config.py). Flushes, INSERT/UPDATE/DELETE and every read
+# after a write in the same transaction stay on the primary, so a request sees its own writes.
+class RoutingSession(Session):
+    def get_bind(self, mapper=None, clause=None, bind=None, **kwargs):
+        engine = super().get_bind(mapper=mapper, clause=clause, bind=bind, **kwargs)
+        engines = db.engines  # Engines of the current app (get_bind always runs in an app context)
+        replica = engines.get("replica")
+        if replica is None or bind is not None or engine is not engines[None]:
+            return engine  # No replica, explicit bind, or a model on another bind
+        if not getattr(clause, "is_select", False):  # True for Select and for lambda_stmt() wrapping one
+            self.info["wrote"] = True  # Flushes, DML, text() and bare get_bind() calls pin the transaction to the primary
+            return engine
+        return engine if self.info.get("wrote") else replica
 
-from flask_sqlalchemy import SQLAlchemy
-from flask_bcrypt import Bcrypt
 
-db = SQLAlchemy()
+@event.listens_for(RoutingSession, "after_commit")
+@event.listens_for(RoutingSession, "after_rollback")
+def _reset_write_flag(session):
+    session.info.pop("wrote", None)  # Next transaction may read from the replica again
+
+
+# Initialize the SQLAlchemy database instance
+db = SQLAlchemy(session_options={"class_": RoutingSession})
 bcrypt = Bcrypt()
 
 # Define a model for the 'sensor_data' table
 class SensorData(db.Model):
     __tablename__ = 'sensor_data'
+    __table_args__ = (
+        db.Index('ix_sensor_datetime_id_battery', 'datetime', 'id', 'battery_health'),  # Range filters / ORDER BY datetime, id; latest battery reading index-only
+    )
     id = db.Column(db.Integer, primary_key=True)
-    steps = db.Column(db.Integer)
+    # Per-log step counts are small; SMALLINT UNSIGNED (2 bytes, max 65535) keeps rows and indexes denser
+    steps = db.Column(db.SmallInteger().with_variant(mysql.SMALLINT(unsigned=True), 'mysql', 'mariadb'))
     datetime = db.Column(db.DateTime)
     raw_voltage = db.Column(db.Float)
     raw_current = db.Column(db.Float)
     battery_health = db.Column(db.Float)  # <-- New column
 
-from flask_bcrypt import Bcrypt
+# Per-day running totals of sensor_data, kept up to date on ingest so the dashboard
+# summary table and charts read one row per day instead of re-aggregating every log
+class DailySummary(db.Model):
+    __tablename__ = 'daily_summary'
 
-bcrypt = Bcrypt()  # Make sure this is initialized globally if not done already
+    date = db.Column(db.Date, primary_key=True)
+    total_steps = db.Column(db.BigInteger, nullable=False, default=0)
+    total_voltage = db.Column(db.Double, nullable=False, default=0.0)
+    total_current = db.Column(db.Double, nullable=False, default=0.0)
+    voltage_count = db.Column(db.Integer, nullable=False, default=0)  # Logs with a voltage reading (AVG denominator)
+    current_count = db.Column(db.Integer, nullable=False, default=0)  # Logs with a current reading (AVG denominator)
+    log_count = db.Column(db.Integer, nullable=False, default=0)
 
 class User(db.Model):
     __tablename__ = 'users'
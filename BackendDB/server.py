@@ -15,35 +15,49 @@
 # ========================  
 
 from datetime import datetime, timedelta  # Import datetime utilities used across request handling and forecasting.
-from functools import wraps  # Import wraps for preserving function metadata in decorators.
-import threading  # Import threading to run background retraining/updating tasks as daemon threads.
-import time  # Import time for sleep in background thread loops.
+from decimal import Decimal  # Import Decimal to serialize DB aggregates that the driver returns as decimals.
+from functools import lru_cache, wraps  # Import lru_cache for memoized parsing and wraps for decorator metadata.
+from concurrent.futures import ThreadPoolExecutor  # Import executor used to bound concurrent bcrypt work.
 import calendar  # Import calendar used for human-friendly month names in CSV exports.
 import csv  # Import csv for generating CSV exports for web UI.
-from io import BytesIO, StringIO  # Import in-memory file buffers for CSV file creation/download.
+import hashlib  # Import hashlib for content-hash ETags on cacheable JSON responses.
+import hmac  # Import hmac for constant-time comparison of secret strings.
+import os  # Import os to detect the Werkzeug reloader's serving process.
+import threading  # Import threading for the chart cache lock and the forecast refresh worker.
+import time  # Import time for the monotonic clock used by short-lived caches.
+from io import StringIO  # Import in-memory text buffer used to build streamed CSV chunks.
+from itertools import islice  # Import islice to cut streamed CSV rows into batches.
 from math import ceil  # Import ceil to compute number of pages for pagination.
 
 # ============================  
 # === Third-Party Packages ===  
 # ============================  
 
+import click  # Import click (ships with Flask) for CLI command output.
 from flask import (  # Import core Flask objects used throughout the app.
     Flask, request, render_template, redirect,  # Flask app, request context, HTML rendering, redirects.
-    url_for, session, flash, send_file, jsonify,  # URL building, session for login, flash messages, file responses, JSON responses.
+    url_for, session, flash, jsonify,  # URL building, session for login, flash messages, JSON responses.
+    Response, stream_with_context,  # Streaming responses (CSV exports) that keep the request context alive.
+    g, has_request_context,  # Per-request scratch space (debug query log) and a guard for using it.
 )  # Close multi-line import block for readability.
+from flask.json.provider import JSONProvider  # Import base class for plugging a faster JSON encoder into jsonify.
 from flask_bcrypt import Bcrypt  # Import Bcrypt for password hashing / verification.
 from flask_cors import CORS  # Import CORS to enable cross-origin requests for API endpoints.
-import pandas as pd  # Import pandas used for aggregation and DataFrame manipulation.
-import numpy as np  # Import numpy for numeric arrays used by sklearn.
-from sklearn.linear_model import LinearRegression  # Import linear regression model used for simple forecasting.
+import numpy as np  # Import numpy for the numeric arrays and least-squares math used by forecasting.
+import orjson  # Import orjson, a compiled JSON encoder/decoder used for all JSON responses and request bodies.
 
 # ===========================  
 # === SQLAlchemy & Models === 
 # ===========================  
 
-from sqlalchemy import func, extract  # Import SQL functions used in aggregated queries.
-from config import SQLALCHEMY_DATABASE_URI, SQLALCHEMY_TRACK_MODIFICATIONS  # Import DB config constants from config module.
-from models import db, SensorData, User  # Import SQLAlchemy db instance and model classes used by the app.
+from sqlalchemy import func, extract, and_, or_, select, insert, delete, lambda_stmt, event  # SQL functions, boolean operators, Core statements, cached lambda statements and engine events.
+from sqlalchemy.engine import Engine  # Engine class, for the debug-mode query counter.
+from sqlalchemy.dialects.mysql import insert as mysql_insert  # INSERT ... ON DUPLICATE KEY UPDATE for the daily summary upsert.
+from config import (  # Import DB config constants from config module.
+    SQLALCHEMY_DATABASE_URI, SQLALCHEMY_TRACK_MODIFICATIONS, SQLALCHEMY_ENGINE_OPTIONS,  # URI, tracking toggle, pool options.
+    SQLALCHEMY_REPLICA_URI, BCRYPT_LOG_ROUNDS,  # Optional read replica, password hashing cost factor.
+)  # Close multi-line import block.
+from models import db, SensorData, DailySummary, User  # Import SQLAlchemy db instance and model classes used by the app.
 
 # =============================
 # === Global Forecast Cache ===  
@@ -52,8 +66,43 @@ from models import db, SensorData, User  # Import SQLAlchemy db instance and mod
 forecast_cache = {  # Top-level in-memory cache used to avoid recomputing daily forecasts on every request.
     "voltage": None,  # Cached next-day predicted voltage; None means not computed or invalidated.
     "current": None,  # Cached next-day predicted current; None means not computed or invalidated.
-    "date": None  # Date when cache was last updated; used to determine staleness.
+    "best_voltage_month": None,  # Cached best-month label for voltage (e.g., 'March 2026') or None.
+    "best_voltage_value": None,  # Cached predicted monthly average voltage for that month.
+    "best_current_month": None,  # Cached best-month label for current or None.
+    "best_current_value": None,  # Cached predicted monthly average current for that month.
+    "date": None,  # Date when cache was last updated; used to determine staleness.
+    "ready": False,  # True once any refresh has completed, i.e. there are (possibly stale) values to serve.
+    "version": 0  # Bumped on every invalidation so a refresh that overlapped new data isn't marked fresh.
 }  # End of forecast_cache definition.
+forecast_state_lock = threading.Lock()  # Makes "publish results + mark fresh" and "bump version + mark stale" atomic.
+
+# Short-lived cache of filtered sensor-log counts, keyed by (start_time, end_time).  # Avoids a COUNT(*) per page view.
+sensor_count_cache = {}  # Maps (start_time, end_time) -> (count, time.monotonic() when computed).
+SENSOR_COUNT_TTL = 60  # Seconds a cached count stays valid; ingestion clears the cache immediately.
+SENSOR_COUNT_MAX_KEYS = 256  # Bound the cache (one key per filter window; month= values are client-controlled).
+
+# Cache-aside copy of chart pages; chart data only changes when new logs arrive.  # Avoids a GROUP BY per chart page.
+chart_cache = {"days": None, "pages": {}, "payloads": {}, "ts": 0.0}  # Day count, page rows, serialized JSON, fetch time.
+chart_cache_lock = threading.Lock()  # Serialize refreshes so concurrent requests don't all run the GROUP BY.
+CHART_CACHE_TTL = 300  # Seconds the cached aggregates stay valid; ingestion clears them immediately.
+CHART_CACHE_MAX_PAGES = 64  # Bound the number of cached pages (days_per_page is client-controlled).
+
+# Speculatively fetched "next" pages of sensor logs for clients paging with ?cursor=.  # Sequential browsing skips the DB.
+sensor_prefetch_cache = {}  # Maps (start_time, end_time, per_page, cursor) -> (rows, next_cursor, forecast version, time.monotonic()).
+SENSOR_PREFETCH_TTL = 30  # Seconds a prefetched page stays valid; ingestion clears the cache immediately.
+SENSOR_PREFETCH_MAX_KEYS = 256  # Bound the cache (one entry per client paging position).
+
+# Dashboard card metrics and summary-table pages, shared by every logged-in user.  # Repeat views skip both aggregate queries.
+dashboard_summary_cache = {}  # Maps (start date, end date, per_page, page, forecast version) -> ((stats, days, rows), time.monotonic()).
+DASHBOARD_SUMMARY_TTL = 30  # Seconds an entry stays valid; ingestion clears the cache immediately.
+DASHBOARD_SUMMARY_MAX_KEYS = 256  # Bound the cache (page numbers are client-controlled).
+
+# Short-lived cache of login credentials keyed by username.  # Repeated login attempts skip the user lookup.
+user_creds_cache = {}  # Maps username -> ((id, password hash) row, time.monotonic() when fetched); existing users only.
+USER_CREDS_TTL = 60  # Seconds a cached lookup stays valid.
+USER_CREDS_MAX_KEYS = 1024  # Bound the cache.
+
+API_MAX_PER_PAGE = 1000  # Largest page /api/v1/sensor-data returns; the whole page is built in memory.
 
 # Minimum months of history required for monthly best-month prediction  # Explain constant below.
 MIN_MONTHS_REQUIRED = 6  # By default require 6 months of historical monthly aggregates for monthly forecasting.
@@ -62,11 +111,36 @@ MIN_MONTHS_REQUIRED = 6  # By default require 6 months of historical monthly agg
 # === Flask App Setup  ===  
 # ========================  
 
+class ORJSONProvider(JSONProvider):  # JSON provider backed by orjson (used by jsonify and request.get_json).
+    """
+    Serialize responses with orjson instead of the stdlib json module. Keys stay sorted like
+    Flask's default provider; NumPy values and Decimal aggregates are handled as well.
+    """  
+    options = orjson.OPT_SORT_KEYS | orjson.OPT_SERIALIZE_NUMPY | orjson.OPT_NON_STR_KEYS  # Match Flask's sorted output.
+
+    @staticmethod
+    def _default(o):  # Fallback for types orjson does not know.
+        if isinstance(o, Decimal):  # SUM/AVG results from MariaDB.
+            return float(o)  # Serialize as a JSON number.
+        raise TypeError(f"Object of type {type(o).__name__} is not JSON serializable")  # Same error as the stdlib.
+
+    def dumps(self, obj, **kwargs):  # Encode to str as the JSONProvider interface expects.
+        return orjson.dumps(obj, default=self._default, option=self.options).decode("utf-8")  # orjson returns bytes.
+
+    def loads(self, s, **kwargs):  # Decode str or bytes.
+        return orjson.loads(s)  # Parse JSON text.
+
 app = Flask(__name__)  # Create Flask application instance with module's name.
+app.json = ORJSONProvider(app)  # Use orjson for jsonify() and request JSON parsing.
 app.config['SQLALCHEMY_DATABASE_URI'] = SQLALCHEMY_DATABASE_URI  # Configure DB URI loaded from config.
 app.config['SQLALCHEMY_TRACK_MODIFICATIONS'] = SQLALCHEMY_TRACK_MODIFICATIONS  # ORM track modifications toggle.
+app.config['SQLALCHEMY_ENGINE_OPTIONS'] = SQLALCHEMY_ENGINE_OPTIONS  # Connection pool sizing and liveness checks.
+if SQLALCHEMY_REPLICA_URI:  # Optional replica: models.RoutingSession sends plain reads there.
+    app.config['SQLALCHEMY_BINDS'] = {'replica': SQLALCHEMY_REPLICA_URI}  # Same pool options as the primary.
 # Keep your existing secret; in production move to env var.  # Security note: secret in code is temporary.
 app.secret_key = "your_super_secret_key"  # Application secret key used for session signing (replace in prod).
+app.config['BCRYPT_LOG_ROUNDS'] = BCRYPT_LOG_ROUNDS  # bcrypt cost factor from config; tune with a benchmark, keep >= 10.
+app.config['QUERY_COUNT_WARN_THRESHOLD'] = 5  # Debug mode: log routes that run more SQL statements than this per request.
 
 db.init_app(app)  # Initialize SQLAlchemy with the Flask app context.
 bcrypt = Bcrypt(app)  # Initialize Bcrypt extension for hashing passwords.
@@ -74,13 +148,94 @@ bcrypt = Bcrypt(app)  # Initialize Bcrypt extension for hashing passwords.
 # Enable CORS only for API endpoints under /api/v1/*  # Security note: only API endpoints allowed cross-origin.
 CORS(app, resources={r"/api/v1/*": {"origins": "*"}})  # Apply CORS rules so external clients can call API endpoints.
 
-@app.before_request  # Flask hook to run before each request to ensure DB tables exist in dev.
-def initialize_database():  # Function that will be executed before each request.
+# ===========================
+# === Debug Query Counter ===
+# ===========================
+def _record_query(conn, cursor, statement, parameters, context, executemany):  # before_cursor_execute listener.
+    """
+    Append each statement to g.queries while a debug request is being counted.
+    """  
+    if has_request_context() and "queries" in g:  # Only requests started by start_query_count.
+        g.queries.append(statement)  # Remember the SQL text for the log line.
+
+def enable_query_counter():  # Attach _record_query to every engine (debug setups only).
+    """
+    Register the before_cursor_execute listener. Runs during app setup, before any request
+    thread exists: at import when FLASK_DEBUG is set (flask --debug run), or from __main__.
+    """  
+    if not event.contains(Engine, "before_cursor_execute", _record_query):  # Idempotent: import and __main__ may both call it.
+        event.listen(Engine, "before_cursor_execute", _record_query)  # Fires for every engine's cursor execution.
+
+if app.debug:  # DEBUG comes from FLASK_DEBUG when the app is created.
+    enable_query_counter()  # Register once at import; production never attaches the listener.
+
+@app.before_request  # Runs before every view.
+def start_query_count():  # Begin counting SQL statements for this request (debug mode only).
+    """
+    In debug mode, collect the statements the request runs so N+1 regressions show up in the log.
+    """  
+    if not app.debug:  # Production pays nothing beyond this check.
+        return  # No counting.
+    g.queries = []  # Fresh log for this request.
+
+@app.after_request  # Runs after every view that returned a response.
+def report_query_count(response):  # Warn about routes that ran too many statements.
+    """
+    Log the route and statement count when it exceeds QUERY_COUNT_WARN_THRESHOLD.
+    """  
+    queries = g.pop("queries", None)  # Statements collected by start_query_count (None outside debug).
+    if queries is not None and len(queries) > app.config['QUERY_COUNT_WARN_THRESHOLD']:  # Too many round-trips.
+        app.logger.warning("%s ran %d SQL statements:\n%s", request.endpoint, len(queries), "\n".join(queries))  # Route, count and SQL.
+    return response  # Response unchanged.
+
+def initialize_database():  # Create missing tables once at startup (not per request).
     """
-    Ensure database tables exist before handling any request.
+    Ensure database tables exist before the server starts handling requests.
     This is helpful during development so you don't need separate migrations for quick tests.
+    Called once from the __main__ block instead of on every request.
     """  
-    db.create_all()  # Create DB tables if they do not exist; no-op if present.
+    with app.app_context():  # create_all needs an application context outside of requests.
+        db.create_all()  # Create DB tables if they do not exist; no-op if present.
+        if db.session.query(DailySummary.date).first() is None and db.session.query(SensorData.id).first() is not None:  # New summary table, existing logs.
+            rebuild_daily_summary()  # Backfill the per-day totals once.
+
+def rebuild_daily_summary():  # Recompute daily_summary from sensor_data in one statement.
+    """
+    Replace every daily_summary row with totals aggregated from sensor_data (backfill / repair).
+    Must run inside an application context.
+    """  
+    db.session.execute(delete(DailySummary))  # Drop existing totals.
+    log_date = func.date(SensorData.datetime)  # Calendar day of each log.
+    db.session.execute(insert(DailySummary).from_select(  # INSERT ... SELECT grouped per day.
+        ["date", "total_steps", "total_voltage", "total_current", "voltage_count", "current_count", "log_count"],
+        select(
+            log_date,  # One row per day.
+            func.coalesce(func.sum(SensorData.steps), 0),  # Steps total.
+            func.coalesce(func.sum(SensorData.raw_voltage), 0.0),  # Voltage total.
+            func.coalesce(func.sum(SensorData.raw_current), 0.0),  # Current total.
+            func.count(SensorData.raw_voltage),  # Non-NULL voltage readings.
+            func.count(SensorData.raw_current),  # Non-NULL current readings.
+            func.count()  # All logs that day.
+        ).group_by(log_date)
+    ))  # End INSERT ... SELECT.
+    db.session.commit()  # Persist the rebuilt totals.
+
+@app.cli.command("init-db")  # `flask --app server init-db` for deployments that don't run this module as __main__.
+def init_db_command():  # CLI wrapper around initialize_database.
+    """
+    Create any missing tables once, outside the request path.
+    """  
+    initialize_database()  # Same one-shot create_all used by the development entrypoint.
+    click.echo("Database tables are up to date.")  # Confirmation for the operator.
+
+@app.cli.command("rebuild-daily-summary")  # `flask --app server rebuild-daily-summary` after bulk imports or manual edits.
+def rebuild_daily_summary_command():  # CLI wrapper around rebuild_daily_summary.
+    """
+    Recompute the daily_summary table from sensor_data.
+    """  
+    rebuild_daily_summary()  # CLI commands already run inside an app context.
+    invalidate_sensor_caches()  # Drop anything cached from the old totals (this process only).
+    click.echo("daily_summary rebuilt.")  # Confirmation for the operator.
 
 # =======================
 # === Auth Decorators ===  
@@ -114,63 +269,104 @@ def api_login_required(f):
 # ==========================  
 # === Forecast Utilities ===  
 # ==========================  
-def prepare_daily_avg_data(field: str):  # Prepare daily averages for a numeric field in SensorData.
+def _fit_line(x, y):  # Closed-form single-feature least squares used by the forecasts.
+    """
+    Fit y = slope * x + intercept by ordinary least squares and return (slope, intercept).
+    Same line as LinearRegression().fit(x, y) for one feature, without the estimator overhead.
+    """  
+    x = np.asarray(x, dtype=np.float64).ravel()  # Flatten (n,1) feature matrices to a plain vector.
+    y = np.asarray(y, dtype=np.float64)  # Targets as float64 (DB averages may arrive as Decimal).
+    x_mean = x.mean()  # Mean of the feature.
+    y_mean = y.mean()  # Mean of the target.
+    dx = x - x_mean  # Centered feature values.
+    denom = (dx * dx).sum()  # Sum of squared deviations of x.
+    slope = (dx * (y - y_mean)).sum() / denom if denom else 0.0  # A single point gives a flat line, as sklearn does.
+    return slope, y_mean - slope * x_mean  # Line passes through the means.
+
+def _fit_predict(x, y, x_future):  # Fit a line and evaluate it at new points.
+    """
+    Fit y = slope * x + intercept (see _fit_line) and evaluate it at x_future.
+    """  
+    slope, intercept = _fit_line(x, y)  # Closed-form fit.
+    return slope * np.asarray(x_future, dtype=np.float64).ravel() + intercept  # Predicted values at x_future.
+
+def prepare_daily_avg_data_both():  # Prepare daily voltage and current averages in one pass.
     """
-    Extract daily average values for the specified field from SensorData.
+    Read daily average voltage and current from the daily_summary totals in one query
+    (one row per day, no GROUP BY over the raw logs).
 
     Returns:
-        X (np.ndarray): day index array (n,1) for regression
-        y (np.ndarray): observed averages
-        df (pandas.DataFrame): full daily DataFrame with columns date, avg_value, day_num
-    """  
-    column = getattr(SensorData, field)  # Dynamically get model column from field name string.
-    daily_data = (  # Build query to compute per-day average for the requested column.
-        db.session.query(  # Use session.query for aggregated SQL functions.
-            func.date(SensorData.datetime).label("date"),  # Group by date only (no time).
-            func.avg(column).label("avg_value")  # Compute average of the numeric column.
+        X (np.ndarray): day index array (n,1) shared by both regressions
+        y_voltage (np.ndarray): observed daily voltage averages (NaN on days without a voltage reading)
+        y_current (np.ndarray): observed daily current averages (NaN on days without a current reading)
+        dates (np.ndarray): datetime64[D] date of each row (ascending)
+    """  
+    daily_data = (  # Build one query computing both per-day averages.
+        db.session.query(  # Per-day totals are maintained on ingest.
+            DailySummary.date.label("date"),  # One row per day.
+            (DailySummary.total_voltage / func.nullif(DailySummary.voltage_count, 0)).label("avg_voltage"),  # Daily average voltage.
+            (DailySummary.total_current / func.nullif(DailySummary.current_count, 0)).label("avg_current")  # Daily average current.
         )
-        .group_by(func.date(SensorData.datetime))  # Group results by date.
-        .order_by(func.date(SensorData.datetime))  # Order ascending by date for consistent indexing.
+        .order_by(DailySummary.date)  # Order ascending by date for consistent indexing (primary key order).
         .all()  # Execute query and fetch all rows.
     )  # End of query assignment.
 
     if not daily_data:  # If there are no rows, return None to signal insufficient data.
-        return None, None, None  # Mirror interface used by callers to check for absence.
+        return None, None, None, None  # Mirror interface used by callers to check for absence.
+
+    n = len(daily_data)  # Number of distinct days.
+    dates = np.array([r.date for r in daily_data], dtype="datetime64[D]")  # Day-resolution dates straight from the rows.
+    y_voltage = np.fromiter((r.avg_voltage for r in daily_data), dtype=np.float64, count=n)  # Observed voltage averages.
+    y_current = np.fromiter((r.avg_current for r in daily_data), dtype=np.float64, count=n)  # Observed current averages.
+    day_num = (dates - dates[0]).astype(np.int64)  # Zero-based day index (rows are ascending, so the first is the minimum).
 
-    df = pd.DataFrame(daily_data, columns=["date", "avg_value"])  # Convert SQL results into a pandas DataFrame.
-    df["date"] = pd.to_datetime(df["date"])  # Ensure date column is a pandas datetime type.
-    df["day_num"] = (df["date"] - df["date"].min()).dt.days  # Compute zero-based day index for regression.
+    X = day_num.reshape(-1, 1)  # Reshape day indices into (n,1) feature matrix.
+    return X, y_voltage, y_current, dates  # Return shared X, both target vectors, and the row dates.
 
-    X = df["day_num"].values.reshape(-1, 1)  # Reshape day indices into (n,1) for sklearn.
-    y = df["avg_value"].values  # Extract observed averages as numpy array.
-    return X, y, df  # Return matrix X, vector y, and the DataFrame for debugging/plotting.
+SUMMARY_COLUMNS = {  # SensorData field -> (daily_summary sum column, reading count column).
+    "raw_voltage": (DailySummary.total_voltage, DailySummary.voltage_count),  # Voltage.
+    "raw_current": (DailySummary.total_current, DailySummary.current_count),  # Current.
+}  # End of field mapping.
 
 def load_monthly_data(field: str, min_months_required: int = MIN_MONTHS_REQUIRED):  # Load monthly aggregated averages.
     """
-    Aggregate monthly averages for the given field (raw_voltage/raw_current).
-    Returns DataFrame with month, avg_value, month_num if enough data exists.
+    Aggregate monthly averages for the given field (raw_voltage/raw_current) from the
+    daily_summary totals (SUM of daily sums / SUM of daily reading counts = the per-log AVG).
+    Returns (months, y, month_num) NumPy arrays if enough data exists:
+    months as datetime64[M], y as monthly averages, month_num as zero-based month index.
     Otherwise returns None.
     """ 
-    column = getattr(SensorData, field)  # Get column reference from field name.
-    # Note: func.date_format is MySQL-specific; adjust if using a different DB.  # Compatibility warning.
-    monthly_data = (  # Query monthly averages using a DB-level date format.
+    first_dt, last_dt = db.session.query(  # Cheap probe: MIN/MAX are answered from the primary key.
+        func.min(DailySummary.date), func.max(DailySummary.date)
+    ).one()  # Single row, NULLs on an empty table.
+    if first_dt is None or (last_dt.year - first_dt.year) * 12 + last_dt.month - first_dt.month + 1 < min_months_required:  # Span too short.
+        return None  # Fewer calendar months than required can exist; skip the full monthly GROUP BY.
+
+    total_col, count_col = SUMMARY_COLUMNS[field]  # Daily sum and reading count for the field.
+    year_col = extract("year", DailySummary.date).label("year")  # Integer year; no per-row string formatting.
+    month_col = extract("month", DailySummary.date).label("month")  # Integer month 1-12.
+    monthly_data = (  # Query monthly averages grouped on (year, month), ~30 summary rows per month.
         db.session.query(  # Start query composition.
-            func.date_format(SensorData.datetime, "%Y-%m-01").label("month"),  # Normalize to first-of-month strings.
-            func.avg(column).label("avg_value")  # Compute monthly average of the column.
+            year_col,  # Calendar year of the bucket.
+            month_col,  # Calendar month of the bucket.
+            (func.sum(total_col) / func.nullif(func.sum(count_col), 0)).label("avg_value")  # Monthly average of the field.
         )
-        .group_by(func.date_format(SensorData.datetime, "%Y-%m-01"))  # Group by the normalized month.
-        .order_by(func.date_format(SensorData.datetime, "%Y-%m-01"))  # Order ascending by month.
+        .group_by(year_col, month_col)  # Group by calendar month.
+        .having(func.sum(count_col) > 0)  # Skip months without a single reading of the field (their average is NULL).
+        .order_by(year_col, month_col)  # Order ascending by month.
         .all()  # Execute and fetch results.
     )  # End query.
 
     if len(monthly_data) < min_months_required:  # If history is shorter than required threshold:
         return None  # Return None so callers can handle insufficient history gracefully.
 
-    df = pd.DataFrame(monthly_data, columns=["month", "avg_value"])  # Construct DataFrame from query results.
-    df["month"] = pd.to_datetime(df["month"])  # Convert month strings into datetime objects (first-of-month).
-    # Convert to continuous month number for regression  # Explain the conversion below.
-    df["month_num"] = (df["month"].dt.year - df["month"].dt.year.min()) * 12 + df["month"].dt.month  # Continuous month number.
-    return df  # Return DataFrame with month, avg_value, month_num for downstream processing.
+    month_index = np.fromiter(  # Continuous month number (year * 12 + month - 1) built from the small result.
+        (int(r.year) * 12 + int(r.month) - 1 for r in monthly_data), dtype=np.int64, count=len(monthly_data)
+    )  # End month index construction.
+    months = (month_index - 1970 * 12).astype("datetime64[M]")  # datetime64[M] counts months since 1970-01.
+    y = np.fromiter((r.avg_value for r in monthly_data), dtype=np.float64, count=len(monthly_data))  # Monthly averages.
+    month_num = month_index - month_index[0]  # Zero-based month number for regression (rows are ascending).
+    return months, y, month_num  # Return arrays for downstream processing.
 
 def predict_highest_month(field: str, min_months_required: int = MIN_MONTHS_REQUIRED):  # Predict the best month in next 12 months.
     """
@@ -179,110 +375,576 @@ def predict_highest_month(field: str, min_months_required: int = MIN_MONTHS_REQU
     Returns:
         (month_name_year, value) or (None, None) if insufficient data
     """  
-    df = load_monthly_data(field, min_months_required=min_months_required)  # Load monthly aggregates.
-    if df is None:  # If insufficient history:
+    monthly = load_monthly_data(field, min_months_required=min_months_required)  # Load monthly aggregates.
+    if monthly is None:  # If insufficient history:
         return None, None  # Indicate lack of prediction.
+    months, y, month_num = monthly  # Unpack month labels, targets and regression feature.
 
-    X = df["month_num"].values.reshape(-1, 1)  # Input features for regression: numeric month numbers.
-    y = df["avg_value"].values  # Targets: monthly average values.
-
-    model = LinearRegression().fit(X, y)  # Fit a simple linear model to capture trend.
-
-    future_months = [df["month_num"].max() + i for i in range(1, 13)]  # Next 12 month continuous indices.
-    predictions = model.predict(np.array(future_months).reshape(-1, 1))  # Predict future monthly averages.
-
-    start_month = df["month"].min()  # Reference smallest month in dataset for offset calculation.
-    predicted_dates = [  # Create datetime objects for each predicted month for readable output.
-        start_month + pd.DateOffset(months=(m - df["month_num"].min()))  # Offset by months relative to earliest.
-        for m in future_months  # Iterate predicted months.
-    ]  # List of pandas.Timestamp objects corresponding to future months.
-
-    best_idx = int(np.argmax(predictions))  # Index of the maximum predicted monthly value.
-    return predicted_dates[best_idx].strftime("%B %Y"), round(float(predictions[best_idx]), 2)  # Return month string and rounded value.
+    slope, intercept = _fit_line(month_num, y)  # Fit the monthly trend.
+    # A line peaks at an end of the 12-month window: the last month if rising, else the first (argmax tie-break).
+    best_offset = 12 if slope > 0 else 1  # Months after the latest observed month.
+    best_value = slope * (month_num[-1] + best_offset) + intercept  # Predicted average for that month.
+    best_month = (months[-1] + best_offset).astype(object)  # datetime64[M] arithmetic -> datetime.date (first of month).
+    return best_month.strftime("%B %Y"), round(float(best_value), 2)  # Return month string and rounded value.
 
 def update_forecast_cache():  # Compute next-day forecasts and persist in forecast_cache.
     """
-    Compute next-day forecasts for voltage & current using daily averages and store
-    results in the in-memory forecast_cache. Exceptions are printed (no crash).
+    Compute next-day forecasts for voltage & current using daily averages, plus the
+    best-month predictions, and store results in the in-memory forecast_cache.
+    Results are computed into a local dict and published with one dict.update(), so readers
+    that take forecast_cache.copy() never see a mix of old and new values.
+    Exceptions are printed (no crash).
     """  
+    version = forecast_cache["version"]  # Invalidation counter at the start of this refresh.
     try:  # Protect forecasting so exceptions don't crash the web process.
-        Xv, yv, dfv = prepare_daily_avg_data("raw_voltage")  # Prepare voltage daily averages.
-        if Xv is not None:  # Only proceed if there is daily data.
-            v_model = LinearRegression().fit(Xv, yv)  # Fit linear model on daily voltage averages.
-            next_day_num = [[int(dfv["day_num"].max() + 1)]]  # Next day index for prediction.
-            forecast_cache["voltage"] = round(float(v_model.predict(next_day_num)[0]), 2)  # Store rounded voltage forecast.
-
-        Xc, yc, dfc = prepare_daily_avg_data("raw_current")  # Prepare current daily averages.
-        if Xc is not None:  # Only proceed if there is daily current data.
-            c_model = LinearRegression().fit(Xc, yc)  # Fit linear model on daily current averages.
-            next_day_num = [[int(dfc["day_num"].max() + 1)]]  # Next day index for prediction.
-            forecast_cache["current"] = round(float(c_model.predict(next_day_num)[0]), 2)  # Store rounded current forecast.
-
-        forecast_cache["date"] = datetime.now().date()  # Mark cache as updated today.
+        results = {"ready": True}  # Requests may serve these values while a later refresh runs.
+        X, yv, yc, _ = prepare_daily_avg_data_both()  # Daily voltage and current averages from one query.
+        if X is not None:  # Only proceed if there is daily data (otherwise keep the previous forecasts).
+            next_day_num = [int(X[-1, 0]) + 1]  # Day after the latest (last, ascending) day, shared by both fits.
+            for key, y in (("voltage", yv), ("current", yc)):  # Fit each series on the days that have readings.
+                has_reading = np.isfinite(y)  # Steps-only days have no average (NULL -> NaN); leave them out of the fit.
+                if has_reading.any():  # Otherwise keep the previous forecast for this series.
+                    results[key] = round(float(_fit_predict(X[has_reading], y[has_reading], next_day_num)[0]), 2)  # Rounded forecast.
+
+        # Best-month predictions only change when new rows arrive, so compute them with the daily forecasts.
+        results["best_voltage_month"], results["best_voltage_value"] = predict_highest_month("raw_voltage")  # Best month by voltage.
+        results["best_current_month"], results["best_current_value"] = predict_highest_month("raw_current")  # Best month by current.
+
+        with forecast_state_lock:  # No invalidation can slip between the version check and the publish.
+            if forecast_cache["version"] == version:  # No new data arrived while computing.
+                results["date"] = datetime.now().date()  # Mark cache as updated today.
+            forecast_cache.update(results)  # Publish every value at once.
         app.logger.debug(f"[Forecast Cache Updated] {forecast_cache['date']}")  # Debug log for visibility.
     except Exception as e:  # Catch-all to avoid raising from background/update call paths.
         app.logger.error(f"[Forecast Cache Error] {e}")  # Log errors for later inspection.
 
-def retrain_forecast_models():  # Background loop that periodically updates the forecast cache.
+@lru_cache(maxsize=4)  # The label only changes at midnight; format it once per day (and per style).
+def forecast_date_label(today, padded=False):  # Human-readable date of the next-day forecast.
+    """
+    Return tomorrow's date relative to `today` as 'October 5, 2025' (dashboard), or with a
+    zero-padded day, 'October 05, 2025', when `padded` is set (the API's historical format).
+    """  
+    tomorrow = today + timedelta(days=1)  # Day the forecast is for.
+    if padded:  # API format.
+        return tomorrow.strftime("%B %d, %Y")  # Zero-padded day.
+    return f"{tomorrow:%B} {tomorrow.day}, {tomorrow.year}"  # Unpadded day on every platform (no %-d fallback needed).
+
+forecast_refresh_event = threading.Event()  # Set to wake the forecast worker early (new data arrived).
+forecast_lock = threading.Lock()  # Held by whichever thread is recomputing forecast_cache.
+
+def refresh_forecast_if_stale(today=None, defer=True):  # Recompute forecast_cache once per day / invalidation, without a stampede.
+    """
+    Recompute forecast_cache if it was not computed `today` (defaults to the current date; pass
+    the request's own date to avoid another clock read). Only one thread refreshes at a time;
+    concurrent callers skip the refresh and keep serving the current (slightly stale) values.
+    With `defer` (requests), a stale cache is handed to the background worker (started on
+    demand) and the old values are served (stale-while-revalidate); the caller only refits
+    itself when nothing has been computed yet.
+    """  
+    if forecast_cache["date"] == (today or datetime.now().date()):  # Fresh: nothing to do (no locking on the hot path).
+        return  # Serve cached values.
+    if defer and forecast_cache["ready"]:  # There are values to serve while the worker recomputes.
+        start_forecast_worker()  # No-op when already running (also covers `flask run` / WSGI servers).
+        forecast_refresh_event.set()  # Wake the worker; this request keeps the previous values.
+        return  # No model fitting on the request thread.
+    if forecast_lock.acquire(blocking=False):  # Only the first caller refits; others don't queue up behind it.
+        try:
+            if forecast_cache["date"] != datetime.now().date():  # Re-check: another thread may have just finished.
+                update_forecast_cache()  # Recompute forecasts and update cache.
+        finally:
+            forecast_lock.release()  # Let the next refresh happen.
+
+def invalidate_forecast():  # Mark the forecast stale and ask the worker to recompute it now.
+    """
+    Called after new sensor rows are stored: requests see a stale cache immediately and the
+    background worker recomputes without waiting for midnight.
+    """  
+    with forecast_state_lock:  # Atomic with respect to update_forecast_cache's publish.
+        forecast_cache["version"] += 1  # Any refresh already in flight must not mark the cache fresh.
+        forecast_cache["date"] = None  # Force a recompute if a request gets there first.
+    forecast_refresh_event.set()  # Wake the worker.
+
+def seconds_until_midnight():  # Time left in the current (server-local) day.
+    """
+    Return the number of seconds until the next local midnight.
+    """  
+    now = datetime.now()  # Current local time.
+    tomorrow = (now + timedelta(days=1)).replace(hour=0, minute=0, second=0, microsecond=0)  # Next midnight.
+    return (tomorrow - now).total_seconds()  # Wait time for the worker.
+
+def forecast_refresh_worker():  # Background loop that refreshes forecasts at midnight or on demand.
+    """
+    Recompute forecast_cache at each local midnight, or as soon as invalidate_forecast() is called,
+    instead of sleeping a fixed 24 h from whenever the server happened to start.
+    """  
+    while True:  # Run for the life of the process (daemon thread).
+        forecast_refresh_event.wait(timeout=seconds_until_midnight())  # Sleep until midnight or an invalidation.
+        forecast_refresh_event.clear()  # Re-arm before recomputing so new invalidations are not lost.
+        with app.app_context():  # DB access needs an application context outside of requests.
+            refresh_forecast_if_stale(defer=False)  # Skipped if a request is already refreshing; errors are logged inside.
+
+forecast_worker = None  # The running forecast-refresh thread, once started.
+forecast_worker_lock = threading.Lock()  # Prevents two requests from starting two workers.
+
+def start_forecast_worker():  # Launch the forecast refresh thread if it is not running yet.
+    """
+    Start forecast_refresh_worker as a daemon thread in the serving process. Idempotent: called
+    at startup by the development entrypoint and lazily by refresh_forecast_if_stale.
+    """  
+    global forecast_worker  # Module-level handle for the running thread.
+    if forecast_worker is not None and forecast_worker.is_alive():  # Common case: already running (no locking).
+        return  # Nothing to do.
+    with forecast_worker_lock:  # One starter at a time.
+        if forecast_worker is None or not forecast_worker.is_alive():  # Re-check under the lock.
+            forecast_worker = threading.Thread(target=forecast_refresh_worker, name="forecast-refresh", daemon=True)  # Background refresher.
+            forecast_worker.start()  # Fire and forget.
+
+# ========================  
+# === Password Hashing ===  
+# ========================  
+
+# bcrypt releases the GIL, so hashing runs in parallel; a small pool caps how many cores  # Explain the executor.
+# login/register bursts can occupy, leaving the rest for dashboard and API requests.  # Why it is bounded.
+HASH_EXECUTOR = ThreadPoolExecutor(max_workers=2, thread_name_prefix="bcrypt")  # At most two hashes at a time.
+
+def hash_password(password):  # Hash a new password on the bounded bcrypt pool.
     """
-    Background thread function that updates forecast_cache daily.
-    Runs forever as a daemon thread when the app starts.
+    Return the bcrypt hash (as text) for `password` using the configured cost factor.
     """  
-    while True:  # Infinite loop intended to run as daemon.
-        update_forecast_cache()  # Recompute and store forecasts in cache.
-        time.sleep(86400)  # Sleep for 24 hours between updates to avoid frequent recompute.
+    return HASH_EXECUTOR.submit(  # Run the expensive hash on the bcrypt pool.
+        bcrypt.generate_password_hash, password, app.config['BCRYPT_LOG_ROUNDS']  # Configured cost factor.
+    ).result().decode("utf-8")  # Wait for the hash and store it as text.
+
+def verify_password(user, password):  # Check a login attempt on the bounded bcrypt pool.
+    """
+    Return True when `password` matches the stored hash of `user` (False for a missing user).
+    `user` is anything with a `password` attribute (a User or a get_user_credentials() row).
+    """  
+    if user is None:  # Unknown username.
+        return False  # Nothing to verify.
+    return HASH_EXECUTOR.submit(bcrypt.check_password_hash, user.password, password).result()  # Constant-time bcrypt check.
+
+def get_user_credentials(username):  # (id, password) for a username, cached briefly.
+    """
+    Return a row with `id` and `password` (the bcrypt hash) for `username`, or None when no such
+    user exists. Found users are reused for USER_CREDS_TTL seconds; misses are not cached, so a
+    just-registered user (possibly not yet on the read replica) is found on the next attempt.
+    """  
+    now = time.monotonic()  # Monotonic clock for TTL checks.
+    cached = user_creds_cache.get(username)  # Previously fetched (row, timestamp) or None.
+    if cached and now - cached[1] < USER_CREDS_TTL:  # Fresh enough to reuse.
+        return cached[0]  # Skip the DB round trip.
+    creds = User.query.with_entities(User.id, User.password).filter_by(username=username).first()  # Two columns only.
+    if creds is None:  # Unknown (or not yet replicated) user.
+        return None  # Not cached: registration or replica catch-up must take effect at once.
+    if len(user_creds_cache) >= USER_CREDS_MAX_KEYS:  # Keep the cache bounded.
+        user_creds_cache.clear()  # Cheap reset; entries are short-lived anyway.
+    user_creds_cache[username] = (creds, now)  # Store row with its timestamp.
+    return creds  # Row or None.
 
 # ============================  
 # === Shared Query Helpers ===  
 # ============================ 
 
+def _next_month(month_start):  # First instant of the following month.
+    """
+    Return the first day of the month after `month_start` (a datetime on the 1st), i.e. the
+    exclusive upper bound of that month for half-open `>= start AND < end` filters.
+    """  
+    if month_start.month == 12:  # December rolls over to January of the next year.
+        return month_start.replace(year=month_start.year + 1, month=1)  # Next year's January.
+    return month_start.replace(month=month_start.month + 1)  # Same year, next month.
+
+@lru_cache(maxsize=128)  # Month strings repeat across requests; parse each one once.
+def _parse_month(month_str):  # Convert 'YYYY-MM' into its [start, end) datetime bounds.
+    """
+    Return (start, end) for the month given as 'YYYY-MM', or (None, None) when it cannot be parsed.
+    """  
+    try:
+        start_time = datetime.fromisoformat(f"{month_str}-01")  # C-level ISO parse validates 'YYYY-MM' in one step.
+        end_time = _next_month(start_time)  # Exclusive end boundary.
+    except ValueError:  # Malformed month string.
+        return None, None  # Treat as no filter.
+    return start_time, end_time  # Month window.
+
+def _parse_time_window(args):  # Resolve the filter/month query params shared by the UI and API.
+    """
+    Return (start_time, end_time) for the request's `month=YYYY-MM` or `filter=day|week|month`
+    params; (None, None) means no time filtering. end_time is None for the open-ended filters.
+    """  
+    month_filter = args.get("month")  # Optional explicit month filter YYYY-MM.
+    if month_filter:  # Month-specific filter takes precedence.
+        return _parse_month(month_filter)  # Memoized parse.
+    filter_type = args.get("filter")  # Optional relative filter.
+    # Windows start at midnight, so they are stable within a day and usable as cache keys.
+    today = datetime.now().replace(hour=0, minute=0, second=0, microsecond=0)  # Midnight of the current day.
+    if filter_type == "day":  # Day filter -> from midnight today.
+        return today, None  # Today's midnight.
+    if filter_type == "week":  # Week filter -> from Monday of this week.
+        return today - timedelta(days=today.weekday()), None  # Monday's midnight.
+    if filter_type == "month":  # Month filter -> from first day of current month.
+        return today.replace(day=1), None  # Start of month.
+    return None, None  # No filtering if no filter params provided.
+
 def get_sensor_query(start_time=None, end_time=None):  # Build a base query for raw SensorData logs with optional time range.
     """
     Return a base SQLAlchemy query for SensorData with optional time filtering.
-    Shared between UI and API to keep behavior consistent.
+    Shared between UI and API to keep behavior consistent. Rows are plain column tuples
+    (id, datetime, steps, raw_voltage, raw_current), not ORM objects.
     """  
-    q = SensorData.query.order_by(SensorData.datetime.desc())  # Base query sorted by newest first.
+    q = db.session.query(  # Select only the displayed columns; skips ORM object construction and identity-map work.
+        SensorData.id, SensorData.datetime, SensorData.steps, SensorData.raw_voltage, SensorData.raw_current
+    ).order_by(SensorData.datetime.desc(), SensorData.id.desc())  # Newest first; id breaks ties for stable paging.
     if start_time and end_time:  # If both bounds provided, filter to start <= datetime < end.
         q = q.filter(SensorData.datetime >= start_time, SensorData.datetime < end_time)  # Inclusive start, exclusive end.
     elif start_time:  # If only start_time provided, filter for rows on/after start_time.
         q = q.filter(SensorData.datetime >= start_time)  # Only lower bound applied.
     return q  # Return the composed SQLAlchemy query object.
 
+def fast_count(query):  # COUNT(*) for a query without Query.count()'s subquery wrapper.
+    """
+    Return the row count of `query` as `SELECT count(*) FROM ... WHERE ...`: the ORDER BY and
+    selected columns are dropped, so MariaDB can answer from an index instead of a derived table.
+    """  
+    stmt = query.order_by(None).statement.with_only_columns(  # Swap the columns for COUNT(*)...
+        func.count(), maintain_column_froms=True  # ...but keep their FROM, which unfiltered queries would otherwise lose.
+    )  # End statement.
+    return db.session.execute(stmt).scalar()  # Single scalar round-trip.
+
+def count_sensor_logs(start_time=None, end_time=None):  # COUNT(*) of the filtered logs, cached briefly.
+    """
+    Return the number of SensorData rows in the time window, reusing a cached value for
+    SENSOR_COUNT_TTL seconds. Ingestion endpoints clear the cache so new rows show up at once.
+    """  
+    key = (start_time, end_time)  # Cache key is the resolved time window.
+    now = time.monotonic()  # Monotonic clock for TTL checks.
+    cached = sensor_count_cache.get(key)  # Previously computed (count, timestamp) or None.
+    if cached and now - cached[1] < SENSOR_COUNT_TTL:  # Fresh enough to reuse.
+        return cached[0]  # Skip the COUNT(*) query.
+    total = fast_count(get_sensor_query(start_time, end_time))  # Plain COUNT(*) over the filtered rows.
+    if len(sensor_count_cache) >= SENSOR_COUNT_MAX_KEYS:  # Keep the cache bounded.
+        sensor_count_cache.clear()  # Cheap reset; entries are short-lived anyway.
+    sensor_count_cache[key] = (total, now)  # Store count with its timestamp.
+    return total  # Return the fresh count.
+
+def parse_sensor_cursor(cursor):  # Decode a keyset pagination cursor.
+    """
+    Parse a cursor of the form '<iso datetime>_<id>' (the last row of the previous page).
+    Returns (datetime, id) or None when the cursor is missing or malformed.
+    """  
+    if not cursor:  # No cursor supplied.
+        return None  # Caller falls back to page-number pagination.
+    try:
+        dt_str, id_str = cursor.rsplit("_", 1)  # Split on the last underscore (ISO strings contain none).
+        return datetime.fromisoformat(dt_str), int(id_str)  # Decode both parts.
+    except ValueError:  # Malformed cursor.
+        return None  # Treat as absent rather than failing the request.
+
+def get_sensor_page(query, per_page, page=1, cursor=None):  # Fetch one page of newest-first sensor logs.
+    """
+    Fetch one page from a get_sensor_query() query.
+    With a cursor, seek directly past the previous page's last row on the (datetime, id)
+    ordering (keyset pagination) instead of making the DB scan and discard OFFSET rows.
+    Without one, fall back to page-number OFFSET pagination.
+    Returns (rows, next_cursor); next_cursor is None on the last page.
+    """  
+    position = parse_sensor_cursor(cursor)  # (datetime, id) of the previous page's last row, or None.
+    if position:  # Keyset: rows strictly after the cursor in newest-first order.
+        last_dt, last_id = position  # Unpack cursor.
+        query = query.filter(or_(  # Expanded row comparison so the datetime index is usable for the range.
+            SensorData.datetime < last_dt,  # Older rows.
+            and_(SensorData.datetime == last_dt, SensorData.id < last_id)  # Same timestamp, lower id.
+        ))
+    else:  # Page-number fallback.
+        query = query.offset((max(page, 1) - 1) * per_page)  # Skip earlier pages.
+    return split_sensor_page(query.limit(per_page + 1).all(), per_page)  # Fetch one extra row to know whether a next page exists.
+
+def split_sensor_page(rows, per_page):  # Trim the look-ahead row and derive the next cursor.
+    """
+    Given up to per_page + 1 newest-first get_sensor_query() rows, return (rows, next_cursor).
+    """  
+    next_cursor = None  # Default: no further pages.
+    if len(rows) > per_page:  # Extra row present -> there is a next page.
+        rows = rows[:per_page]  # Drop the look-ahead row.
+        next_cursor = f"{rows[-1].datetime.isoformat()}_{rows[-1].id}"  # Cursor for the following page.
+    return rows, next_cursor  # Page rows plus cursor.
+
+PREFETCH_EXECUTOR = ThreadPoolExecutor(max_workers=1, thread_name_prefix="prefetch")  # One background page read at a time.
+
+def _prefetch_sensor_page(start_time, end_time, per_page, cursor, version):  # Background read of the page after `cursor`.
+    """
+    Fetch the page that follows `cursor` and keep it in sensor_prefetch_cache, unless new data
+    was ingested meanwhile (the forecast version changed).
+    """  
+    with app.app_context():  # DB access needs an application context outside of requests.
+        rows, next_cursor = get_sensor_page(get_sensor_query(start_time, end_time), per_page, cursor=cursor)  # Keyset read.
+    if forecast_cache["version"] != version:  # Ingestion happened while reading; rows may be stale.
+        return  # Drop the result.
+    if len(sensor_prefetch_cache) >= SENSOR_PREFETCH_MAX_KEYS:  # Keep the cache bounded.
+        sensor_prefetch_cache.clear()  # Cheap reset; entries are short-lived anyway.
+    sensor_prefetch_cache[(start_time, end_time, per_page, cursor)] = (rows, next_cursor, version, time.monotonic())  # Store.
+
+def prefetch_sensor_page(start_time, end_time, per_page, cursor):  # Schedule a background read of the next page.
+    """
+    Queue a read of the page after `cursor` so a client browsing sequentially finds it ready.
+    """  
+    if cursor:  # Only when a next page exists.
+        PREFETCH_EXECUTOR.submit(_prefetch_sensor_page, start_time, end_time, per_page, cursor, forecast_cache["version"])  # Fire and forget.
+
+def take_prefetched_sensor_page(start_time, end_time, per_page, cursor):  # Consume a prefetched page if still valid.
+    """
+    Return (rows, next_cursor) from sensor_prefetch_cache, or None when nothing fresh is cached.
+    """  
+    entry = sensor_prefetch_cache.pop((start_time, end_time, per_page, cursor), None)  # Each prefetched page is used once.
+    if entry and entry[2] == forecast_cache["version"] and time.monotonic() - entry[3] < SENSOR_PREFETCH_TTL:  # Fresh and current.
+        return entry[0], entry[1]  # Rows and the following cursor.
+    return None  # Caller reads from the DB.
+
+def get_sensor_page_with_total(start_time, end_time, per_page, page=1, cursor=None):  # Page plus total count.
+    """
+    Fetch one page of the filtered logs together with the total number of matching rows.
+    When the count is not cached and the request is a page-number request, the total is read
+    from COUNT(*) OVER() on the page query itself, so rows and total come back in one round trip.
+    Returns (rows, next_cursor, total).
+    """  
+    cached = sensor_count_cache.get((start_time, end_time))  # Previously computed (count, timestamp) or None.
+    fresh = cached and time.monotonic() - cached[1] < SENSOR_COUNT_TTL  # Whether the cached count is usable.
+    if fresh or parse_sensor_cursor(cursor):  # Keyset pages only see rows past the cursor, so OVER() would undercount.
+        page_data = cursor and take_prefetched_sensor_page(start_time, end_time, per_page, cursor)  # Prefetched by an earlier request?
+        if not page_data:  # Not prefetched (or stale): read it now.
+            page_data = get_sensor_page(get_sensor_query(start_time, end_time), per_page, page=page, cursor=cursor)  # Plain page.
+        return page_data[0], page_data[1], count_sensor_logs(start_time, end_time)  # Cached (or freshly counted) total.
+
+    rows = (  # Page-number request with a cold count: fetch rows and the window total together.
+        get_sensor_query(start_time, end_time)
+        .add_columns(func.count().over().label("_total"))  # Total of the filtered set, computed before LIMIT.
+        .offset((max(page, 1) - 1) * per_page)  # Skip earlier pages.
+        .limit(per_page + 1)  # One extra row to detect a next page.
+        .all()
+    )  # End windowed page query.
+    if not rows:  # Past the last page: no row carries the total.
+        return [], None, count_sensor_logs(start_time, end_time)  # Fall back to the (cached) COUNT(*).
+    total = rows[0]._total  # Same value on every row.
+    if len(sensor_count_cache) >= SENSOR_COUNT_MAX_KEYS:  # Keep the cache bounded.
+        sensor_count_cache.clear()  # Cheap reset; entries are short-lived anyway.
+    sensor_count_cache[(start_time, end_time)] = (total, time.monotonic())  # Seed the count cache for later pages.
+    page_rows, next_cursor = split_sensor_page(rows, per_page)  # Rows carry an extra _total column; callers ignore it.
+    return page_rows, next_cursor, total  # Rows, cursor and total.
+
 def get_summary_query(start_time=None, end_time=None):  # Build query that aggregates daily totals for summary table.
     """
-    Return a SQLAlchemy query that aggregates daily summaries (sum of steps, voltage, current).
+    Return a SQLAlchemy query over the daily_summary table (sum of steps, voltage, current per day).
+    Rows are plain (date, total_steps, total_voltage, total_current) tuples; totals are never NULL,
+    so callers need no `or 0` guards. Windows are whole days: start_time/end_time are truncated to dates.
     """  
-    q = (  # Compose aggregate query to compute daily sums.
-        db.session.query(  # Use session.query for grouping and aggregation.
-            func.date(SensorData.datetime).label('date'),  # Group by date.
-            func.sum(SensorData.steps).label('total_steps'),  # Sum steps per day.
-            func.sum(SensorData.raw_voltage).label('total_voltage'),  # Sum voltage per day.
-            func.sum(SensorData.raw_current).label('total_current')  # Sum current per day.
+    q = (  # Read the per-day totals maintained on ingest; no aggregation over sensor_data.
+        db.session.query(  # One row per day already.
+            DailySummary.date.label('date'),  # Day of the totals.
+            DailySummary.total_steps.label('total_steps'),  # Steps that day.
+            DailySummary.total_voltage.label('total_voltage'),  # Voltage sum that day.
+            DailySummary.total_current.label('total_current')  # Current sum that day.
         )
-        .group_by(func.date(SensorData.datetime))  # Group rows by date.
-        .order_by(func.date(SensorData.datetime).desc())  # Order by date descending for most recent first.
+        .order_by(DailySummary.date.desc())  # Order by date descending for most recent first.
     )  # End of query composition.
     if start_time and end_time:  # Apply time window filters if both provided.
-        q = q.filter(SensorData.datetime >= start_time, SensorData.datetime < end_time)  # Inclusive/exclusive window.
+        q = q.filter(DailySummary.date >= start_time.date(), DailySummary.date < end_time.date())  # Inclusive/exclusive window.
     elif start_time:  # If only start_time specified, apply lower bound.
-        q = q.filter(SensorData.datetime >= start_time)  # Include rows from start_time onward.
+        q = q.filter(DailySummary.date >= start_time.date())  # Include days from start_time onward.
     return q  # Return the aggregate query object for callers to call .all(), .paginate(), etc.
 
-def get_chart_query():  # Build query returning daily aggregates tailored for chart consumption.
+def get_chart_query(limit=None, offset=0):  # Build statement returning daily aggregates tailored for chart consumption.
     """
-    Return a SQLAlchemy query that produces daily aggregates used for charts.
+    Return a lambda statement that produces daily aggregates used for charts, newest day first.
+    With `limit`, only that window of days is selected (LIMIT/OFFSET in SQL).
+    lambda_stmt caches the constructed statement and its compiled SQL, so repeated calls skip
+    rebuilding the expression tree. Execute with db.session.execute(get_chart_query(...)).
     """ 
-    q = (  # Compose query for chart-friendly aggregates.
-        db.session.query(  # Use session.query to leverage SQL aggregation.
-            func.date(SensorData.datetime).label('date'),  # Date only label for X axis.
-            func.avg(SensorData.raw_voltage).label('avg_voltage'),  # Per-day average voltage for charts.
-            func.avg(SensorData.raw_current).label('avg_current'),  # Per-day average current for charts.
-            func.sum(SensorData.steps).label('total_steps')  # Daily steps sum for inclusion in chart dataset.
+    stmt = lambda_stmt(lambda: (  # Compose once; later calls hit SQLAlchemy's lambda/compiled cache.
+        select(  # Core select of chart-friendly aggregates.
+            DailySummary.date.label('date'),  # Date only label for X axis.
+            (DailySummary.total_voltage / func.nullif(DailySummary.voltage_count, 0)).label('avg_voltage'),  # Per-day average voltage (NULL without readings, like AVG).
+            (DailySummary.total_current / func.nullif(DailySummary.current_count, 0)).label('avg_current'),  # Per-day average current.
+            DailySummary.total_steps.label('total_steps')  # Daily steps sum for inclusion in chart dataset.
         )
-        .group_by(func.date(SensorData.datetime))  # Group by day.
-        .order_by(func.date(SensorData.datetime).desc())  # Order descending for consistent pagination slicing.
-    )  # End query composition.
-    return q  # Return query object for further slicing and execution.
+        .order_by(DailySummary.date.desc())  # Order descending for consistent pagination slicing.
+    ))  # End statement composition.
+    if limit:  # Page the days in SQL instead of slicing every day in Python.
+        stmt += lambda s: s.limit(limit).offset(offset)  # Limit/offset become bound parameters of the cached SQL.
+    return stmt  # Statement ready for db.session.execute().
+
+def _expire_chart_cache(days=None):  # Reset chart_cache when invalidated or past its TTL (call with chart_cache_lock held).
+    """
+    Drop cached pages and payloads computed from older data and re-read the day count,
+    unless the caller already has it (`days`, e.g. from the dashboard metrics query).
+    """  
+    now = time.monotonic()  # Monotonic clock for TTL checks.
+    if chart_cache["days"] is None or now - chart_cache["ts"] >= CHART_CACHE_TTL:  # Invalidated or expired.
+        chart_cache["pages"].clear()  # Drop pages computed from older data.
+        chart_cache["payloads"].clear()  # Drop JSON rendered from those pages.
+        if days is None:  # Caller has no fresh count: read it.
+            days = db.session.query(func.count(DailySummary.date)).scalar() or 0  # One summary row per day.
+        chart_cache["days"] = days  # Day count for chart pagination.
+        chart_cache["ts"] = now  # Start a new TTL window.
+
+def get_chart_page(days_per_page, page, days=None):  # One chart page, served from chart_cache while fresh.
+    """
+    Return (rows, total_pages) for the requested chart page, rows in chronological order.
+    Only that page of days is read from the DB (LIMIT/OFFSET) and the page count comes from the
+    number of daily_summary rows (or `days` when the caller already counted them); both are
+    cached for CHART_CACHE_TTL seconds.
+    """  
+    with chart_cache_lock:  # One refresh at a time; others wait and then reuse its result.
+        _expire_chart_cache(days)  # Start a new TTL window if invalidated or expired.
+        key = (days_per_page, page)  # Pages are cached per size and number.
+        rows = chart_cache["pages"].get(key)  # Previously fetched page or None.
+        if rows is None:  # Cache miss: read just this window of days.
+            if len(chart_cache["pages"]) >= CHART_CACHE_MAX_PAGES:  # Keep the cache bounded.
+                chart_cache["pages"].clear()  # Cheap reset; pages are cheap to re-read.
+            rows = db.session.execute(  # Newest-first window of at most days_per_page rows.
+                get_chart_query(days_per_page, (page - 1) * days_per_page)
+            ).all()[::-1]  # Reverse the small window so the earliest date is first on the chart.
+            chart_cache["pages"][key] = rows  # Remember the page.
+        days = chart_cache["days"]  # Distinct-day count for pagination.
+    return rows, (ceil(days / days_per_page) if days else 1)  # Page rows plus page count.
+
+def get_chart_payload(days_per_page, page):  # Serialized /api/chart-data response body for one page.
+    """
+    Return the JSON bytes for a chart page. The body is identical for every logged-in user, so it
+    is serialized once and reused from chart_cache until the data changes or the TTL expires.
+    """  
+    key = (days_per_page, page)  # Same key as the cached page rows.
+    with chart_cache_lock:  # Read under the lock so an expiry cannot interleave.
+        _expire_chart_cache()  # Start a new TTL window if invalidated or expired.
+        payload = chart_cache["payloads"].get(key)  # Previously serialized body or None.
+        generation = chart_cache["ts"]  # Identify the cache window this payload belongs to.
+    if payload is not None:  # Cache hit: no query, no serialization.
+        return payload  # Pre-serialized JSON.
+    rows, total_pages = get_chart_page(days_per_page, page)  # Cached SQL-paged window of daily aggregates.
+    payload = app.json.dumps({  # Return JSON matching front-end expectations: labels and series arrays.
+        **build_chart_series(rows),  # labels / voltage / current / steps series.
+        "total_pages": total_pages,  # Total pages for chart pagination controls.
+        "current_page": page  # Current page index for UI.
+    }).encode("utf-8")  # Store bytes ready to send.
+    with chart_cache_lock:  # Publish the payload unless the cache was reset meanwhile.
+        if chart_cache["days"] is not None and chart_cache["ts"] == generation:  # Still the same cache window.
+            if len(chart_cache["payloads"]) >= CHART_CACHE_MAX_PAGES:  # Keep the cache bounded.
+                chart_cache["payloads"].clear()  # Cheap reset; payloads are cheap to rebuild.
+            chart_cache["payloads"][key] = payload  # Reuse for later requests.
+    return payload  # Serialized body.
+
+def invalidate_sensor_caches():  # Drop every cache derived from sensor_data after new rows are written.
+    """
+    Mark the forecast stale and clear the cached log counts and chart pages.
+    """  
+    invalidate_forecast()  # Forecast is stale; the worker recomputes it in the background.
+    sensor_count_cache.clear()  # Cached log counts no longer include the new rows.
+    sensor_prefetch_cache.clear()  # Prefetched pages may miss the new rows.
+    dashboard_summary_cache.clear()  # Card metrics and summary pages changed.
+    chart_cache["days"] = None  # Chart pages and the day count must be re-read.
+
+def summarize_daily_totals(summary_query):  # Dashboard card metrics aggregated in SQL.
+    """
+    Compute total/avg/max/min of steps, voltage and current over the days of `summary_query`
+    (as returned by get_summary_query) in one aggregate query; only a single row comes back.
+    Returns (stats dict, number of days). Empty windows report 0 for every metric.
+    """ 
+    subq = summary_query.order_by(None).subquery()  # Per-day rows as a derived table (ORDER BY is pointless here).
+    columns = []  # Aggregate expressions, four per metric.
+    for name in ("steps", "voltage", "current"):  # Same metric order as the cards.
+        column = subq.c[f"total_{name}"]  # Daily totals for this metric.
+        columns += [func.sum(column), func.avg(column), func.max(column), func.min(column)]  # total, avg, max, min.
+    row = db.session.query(*columns, func.count()).one()  # Second-stage aggregation happens in the database.
+    days = row[-1]  # Number of days in the window.
+    stats = {}  # Metric name -> value.
+    for index, name in enumerate(("steps", "voltage", "current")):  # Unpack four values per metric.
+        total, avg, maximum, minimum = row[index * 4 : index * 4 + 4]  # Aggregates for this metric.
+        if not days:  # No data in the selected window.
+            stats.update({f"total_{name}": 0, f"avg_{name}": 0.0, f"max_{name}": 0, f"min_{name}": 0})  # Same fallbacks as before.
+            continue  # Next metric.
+        cast = int if name == "steps" else float  # Steps are whole numbers; voltage/current are floats (MariaDB returns Decimal sums).
+        stats[f"total_{name}"] = cast(total)  # Total across period.
+        stats[f"avg_{name}"] = float(avg)  # Average per day.
+        stats[f"max_{name}"] = cast(maximum)  # Max daily value.
+        stats[f"min_{name}"] = cast(minimum)  # Min daily value.
+    return stats, days  # Consumed by the dashboard view.
+
+def get_dashboard_summary(start_time, end_time, per_page, page):  # Card metrics plus one summary-table page, cached briefly.
+    """
+    Return (stats, days, rows) for the dashboard: summarize_daily_totals() over the window and
+    the requested LIMIT/OFFSET page of daily totals. Cached for DASHBOARD_SUMMARY_TTL seconds,
+    keyed by the window's dates (the summary is per day) and the forecast version, so entries
+    computed before an ingest are never reused after it.
+    """  
+    key = (  # Whole-day window, page and data version.
+        start_time and start_time.date(), end_time and end_time.date(),  # 'week' filters differ per request only in the time of day.
+        per_page, page, forecast_cache["version"]
+    )  # End key.
+    cached = dashboard_summary_cache.get(key)  # Previously computed (value, timestamp) or None.
+    if cached and time.monotonic() - cached[1] < DASHBOARD_SUMMARY_TTL:  # Fresh enough.
+        return cached[0]  # Reuse without touching the DB.
+    summary_query = get_summary_query(start_time, end_time)  # Daily totals for the window.
+    stats, days = summarize_daily_totals(summary_query)  # Card metrics and day count.
+    rows = summary_query.limit(per_page).offset((page - 1) * per_page).all()  # Current page of days.
+    if len(dashboard_summary_cache) >= DASHBOARD_SUMMARY_MAX_KEYS:  # Keep the cache bounded.
+        dashboard_summary_cache.clear()  # Cheap reset; entries are cheap to recompute.
+    dashboard_summary_cache[key] = ((stats, days, rows), time.monotonic())  # Remember for later views.
+    return stats, days, rows  # Consumed by the dashboard view.
+
+def build_chart_series(chart_rows):  # Turn a page of daily chart aggregates into the series used by Chart.js.
+    """
+    Convert (date, avg_voltage, avg_current, total_steps) rows into chart labels and series.
+    Numeric columns are rounded/cast as whole vectors with NumPy instead of per element.
+    """ 
+    values = np.array([row[1:] for row in chart_rows], dtype=np.float64).reshape(-1, 3)  # Columns: voltage, current, steps.
+    return {  # Chart payload shared by the dashboard and the chart AJAX endpoint.
+        "labels": [f"{calendar.month_abbr[row[0].month]} {row[0].day:02d}" for row in chart_rows],  # Labels like 'Sep 01' (same as %b %d).
+        "voltage": np.round(values[:, 0], 2).tolist(),  # Voltage series rounded to 2 decimals.
+        "current": np.round(values[:, 1], 2).tolist(),  # Current series rounded to 2 decimals.
+        "steps": np.nan_to_num(values[:, 2]).astype(np.int64).tolist()  # Steps series as ints (missing -> 0).
+    }  # End of chart series dict.
+
+def _fmt_dt(dt):  # Format a datetime as 'YYYY-MM-DD HH:MM:SS' without strftime.
+    """
+    Same output as dt.strftime("%Y-%m-%d %H:%M:%S"), but isoformat() is implemented in C and
+    several times faster per row, which adds up in the JSON/CSV loops that format every log.
+    """ 
+    return dt.isoformat(" ", "seconds")  # Space separator, no microseconds.
+
+def cacheable_json_response(payload):  # JSON response browsers may cache but must revalidate.
+    """
+    Wrap serialized JSON bytes in a response with a content-hash ETag and private, no-cache,
+    answering 304 Not Modified when the client's If-None-Match already has this body.
+    """ 
+    response = Response(payload, mimetype="application/json")  # Same content type as jsonify.
+    response.set_etag(hashlib.blake2b(payload, digest_size=8).hexdigest())  # Strong ETag from the body.
+    response.cache_control.private = True  # Session-protected data: browser cache only, never shared proxies.
+    response.cache_control.no_cache = True  # Always revalidate, so new logs show up at once; unchanged data costs a 304.
+    return response.make_conditional(request)  # Turns into 304 with an empty body on an ETag match.
+
+def stream_csv(header, rows, filename, batch_size=500):  # Build a streaming CSV download response.
+    """
+    Stream CSV to the client as rows are produced instead of buffering the whole file.
+    `rows` is any iterable of sequences (e.g. a yield_per query mapped to lists), so the
+    result set is never fully materialized; rows go to writer.writerows() `batch_size` at a
+    time (the C writer loops internally) and each batch is flushed as one chunk.
+    """ 
+    def generate():  # Generator producing CSV text chunks.
+        buffer = StringIO()  # Small reusable text buffer for csv.writer.
+        writer = csv.writer(buffer)  # CSV writer over the buffer.
+        writer.writerow(header)  # Header row first.
+        row_iter = iter(rows)  # Consume the source lazily, one batch at a time.
+        while batch := list(islice(row_iter, batch_size)):  # Next batch_size rows (empty list ends the loop).
+            writer.writerows(batch)  # Write the whole batch in one C-level loop.
+            yield buffer.getvalue()  # Send accumulated CSV text.
+            buffer.seek(0)  # Rewind buffer.
+            buffer.truncate(0)  # Drop already-sent text.
+        yield buffer.getvalue()  # Send the header when there were no rows (empty otherwise).
+
+    return Response(  # Streamed response; stream_with_context keeps the app/DB context alive while iterating.
+        stream_with_context(generate()),  # Lazily evaluated body.
+        mimetype='text/csv',  # MIME type for CSV files.
+        headers={'Content-Disposition': f'attachment; filename="{filename}"'}  # Force download with suggested filename.
+    )  # End of Response construction.
 
 # ========================= 
 # === Authentication UI ===  
@@ -294,8 +956,8 @@ def login():  # Login view for HTML UI users.
     Web UI login (HTML). On successful login sets Flask session and redirects to the dashboard.
     """ 
     if request.method == "POST":  # Only attempt authentication during POST requests.
-        user = User.query.filter_by(username=request.form["username"]).first()  # Lookup user by username from form.
-        if user and user.check_password(request.form["password"]):  # Verify provided password.
+        user = get_user_credentials(request.form["username"])  # Cached (id, password hash) lookup by username.
+        if verify_password(user, request.form["password"]):  # Verify provided password.
             session["user_id"] = user.id  # Set user id into session to mark authentication.
             return redirect(url_for("sensor_dashboard"))  # Redirect to protected dashboard after successful login.
         flash("Invalid credentials", "danger")  # If auth failed, flash an error message for UI.
@@ -310,6 +972,8 @@ def logout():  # Logout view to remove session credentials.
     flash("Logged out", "success")  # Flash success message for user feedback.
     return redirect(url_for("login"))  # Redirect back to login page after logout.
 
+_ADMIN_TOKEN = b'$sudo-apt: enable | acc | reg | "TRUE" / admin'  # Registration gate command as bytes for compare_digest.
+
 @app.route("/register", methods=["GET", "POST"])  # Route for registering new users (Admin gate kept intentionally).
 def register():  # Registration view for creating Admin users with a playful sudo gate.
     """
@@ -317,10 +981,13 @@ def register():  # Registration view for creating Admin users with a playful sud
     It will continue to require the same check to create Admin users.
     """ 
     if request.method == "POST":  # Only process registration when POSTed form data is present.
-        if request.form["sudo_command"].strip() != '$sudo-apt: enable | acc | reg | "TRUE" / admin':  # Validate the exact 'sudo' string.
+        if not hmac.compare_digest(  # Validate the exact 'sudo' string in constant time.
+            request.form["sudo_command"].strip().encode("utf-8"),  # Submitted command as bytes.
+            _ADMIN_TOKEN  # Expected command, encoded once at import.
+        ):
             return "<h3>Unauthorized: Admin command verification failed</h3>", 403  # Deny creation on mismatch.
 
-        hashed_pw = bcrypt.generate_password_hash(request.form["password"]).decode("utf-8")  # Hash password before storing.
+        hashed_pw = hash_password(request.form["password"])  # Hash password before storing (configured cost factor).
         user = User(name=None, username=request.form["username"], password=hashed_pw, role="Admin")  # Construct new User model.
         db.session.add(user)  # Add user to session for insertion.
         db.session.commit()  # Commit transaction to persist user.
@@ -336,6 +1003,90 @@ def index():  # Index view that simply redirects to sensor_dashboard.
 # === Data Ingestion API & UI ===  
 # ===============================  
 
+MAX_STEPS_PER_LOG = 65535  # sensor_data.steps is SMALLINT UNSIGNED (see migrations/002).
+
+def build_log_mapping(data):  # Convert one incoming log payload into SensorData column values.
+    """
+    Validate one sensor log payload (JSON object or form mapping) and return a dict of
+    SensorData column values with numeric types cast. Shared by single and batch ingestion.
+    Raises ValueError with a client-facing message when a field cannot be parsed.
+    """ 
+    def number(field, cast):  # Cast one optional numeric field; non-scalars (lists, objects) are rejected too.
+        value = data.get(field)  # Raw field value from the payload.
+        if value is None:  # Field omitted or null.
+            return None  # Stored as NULL.
+        try:  # int()/float() raise ValueError on bad strings and TypeError on lists/dicts.
+            return cast(value)  # Converted value.
+        except (TypeError, ValueError):  # Anything that is not a number.
+            raise ValueError(f"Invalid {field} value")  # Message returned to the client as-is.
+
+    dt_str = data.get("datetime")  # Extract ISO datetime string.
+
+    # Validate datetime  # Comments describing validation step next.
+    try:  # Attempt to parse provided datetime string to a datetime object.
+        if dt_str.endswith(("Z", "z")):  # UTC designator many devices send; fromisoformat rejects it before Python 3.11.
+            dt_str = dt_str[:-1] + "+00:00"  # Equivalent explicit offset.
+        dt = datetime.fromisoformat(dt_str)  # C-implemented ISO 8601 parser; raises ValueError on bad format.
+    except (AttributeError, ValueError):  # Missing (None / non-string) or malformed datetime.
+        raise ValueError("Invalid datetime format. Use ISO 8601 format")  # Message returned to the client as-is.
+    if dt.tzinfo is not None:  # Offset given: store server-local wall time, like every other (naive) row.
+        dt = dt.astimezone().replace(tzinfo=None)  # Convert, then drop tzinfo for the naive DATETIME column.
+
+    steps = number("steps", int)  # Steps counted since the previous reading.
+    if steps is not None and not 0 <= steps <= MAX_STEPS_PER_LOG:  # Would fail (strict) or be clamped by the column.
+        raise ValueError(f"steps must be between 0 and {MAX_STEPS_PER_LOG}")  # Keeps daily_summary in line with sensor_data.
+
+    return {  # Column values with casted numeric types.
+        "datetime": dt,  # Parsed datetime.
+        "steps": steps,  # Validated steps or None.
+        "raw_voltage": number("raw_voltage", float),  # Convert voltage to float or None.
+        "raw_current": number("raw_current", float),  # Convert current to float or None.
+        "battery_health": number("battery_health", float)  # Convert battery health to float or None.
+    }  # End of column mapping.
+
+def record_daily_summary(rows):  # Add newly inserted logs to the per-day totals (same transaction).
+    """
+    Upsert the contribution of `rows` (build_log_mapping() dicts) into daily_summary.
+    Call before committing the inserted logs so both land in one transaction.
+    """  
+    per_day = {}  # date -> [steps, voltage, current, voltage_count, current_count, log_count]
+    for row in rows:  # Fold the batch into per-day deltas first (one upsert row per day).
+        totals = per_day.setdefault(row["datetime"].date(), [0, 0.0, 0.0, 0, 0, 0])  # Deltas for this day.
+        if row["steps"] is not None:  # NULL steps add nothing, as SUM() would.
+            totals[0] += row["steps"]  # Steps delta.
+        if row["raw_voltage"] is not None:  # Only non-NULL readings count towards the average.
+            totals[1] += row["raw_voltage"]  # Voltage delta.
+            totals[3] += 1  # One more voltage reading.
+        if row["raw_current"] is not None:  # Same for current.
+            totals[2] += row["raw_current"]  # Current delta.
+            totals[4] += 1  # One more current reading.
+        totals[5] += 1  # Every log counts.
+    values = [  # Insert values, one per affected day.
+        dict(date=day, total_steps=t[0], total_voltage=t[1], total_current=t[2],
+             voltage_count=t[3], current_count=t[4], log_count=t[5])
+        for day, t in per_day.items()
+    ]  # End values.
+
+    if db.session.get_bind().dialect.name in ("mysql", "mariadb"):  # Production: atomic upsert in one statement.
+        stmt = mysql_insert(DailySummary).values(values)  # Multi-row INSERT.
+        db.session.execute(stmt.on_duplicate_key_update(  # Existing day: add the deltas.
+            total_steps=DailySummary.total_steps + stmt.inserted.total_steps,
+            total_voltage=DailySummary.total_voltage + stmt.inserted.total_voltage,
+            total_current=DailySummary.total_current + stmt.inserted.total_current,
+            voltage_count=DailySummary.voltage_count + stmt.inserted.voltage_count,
+            current_count=DailySummary.current_count + stmt.inserted.current_count,
+            log_count=DailySummary.log_count + stmt.inserted.log_count,
+        ))  # End upsert.
+        return  # Done.
+
+    for value in values:  # Other backends (local experiments): read-modify-write per day.
+        summary = db.session.get(DailySummary, value["date"])  # Existing totals or None.
+        if summary is None:  # First log of the day.
+            db.session.add(DailySummary(**value))  # New row.
+            continue  # Next day.
+        for column in ("total_steps", "total_voltage", "total_current", "voltage_count", "current_count", "log_count"):  # Add deltas.
+            setattr(summary, column, getattr(summary, column) + value[column])  # Increment in place.
+
 @app.route("/add-log", methods=["POST"])  # Endpoint to receive sensor log submissions via form or JSON.
 def add_log():  # Handler to create a new SensorData record from incoming payload.
     """
@@ -345,45 +1096,29 @@ def add_log():  # Handler to create a new SensorData record from incoming payloa
     
     Accepts:
       - Web form submission (application/x-www-form-urlencoded)
-      - JSON body (application/json)
+      - JSON body (application/json): one log object, or an array of them (handled as /api/v1/add-logs)
     """ 
+    if request.is_json and isinstance(request.get_json(silent=True), list):  # Device sent a buffered batch.
+        return api_add_logs()  # One INSERT and one commit for the whole array.
     try:  # Wrap ingestion logic in try/except to rollback DB on failure.
-        # Detect if request is JSON or form  # Inline comment clarifying branching below.
-        if request.is_json:  # If content-type indicates JSON use get_json().
-            data = request.get_json()  # Parse JSON payload.
-            steps = data.get("steps")  # Extract steps field from JSON.
-            dt_str = data.get("datetime")  # Extract ISO datetime string from JSON.
-            raw_voltage = data.get("raw_voltage")  # Extract voltage reading from JSON.
-            raw_current = data.get("raw_current")  # Extract current reading from JSON.
-            battery_health = data.get("battery_health")  # Extract battery health reading from JSON.
-        else:  # If not JSON => treat as form-encoded submission.
-            form = request.form  # Access the Flask request.form mapping.
-            steps = form.get("steps")  # Extract steps from form.
-            dt_str = form.get("datetime")  # Extract datetime string from form.
-            raw_voltage = form.get("raw_voltage")  # Extract voltage from form.
-            raw_current = form.get("raw_current")  # Extract current from form.
-            battery_health = form.get("battery_health")  # Extract battery health field from form.
-
-        # Validate datetime  # Comments describing validation step next.
-        try:  # Attempt to parse provided datetime string to a datetime object.
-            dt = datetime.fromisoformat(dt_str)  # Use ISO8601 parser; raises ValueError on bad format.
-        except ValueError:  # If parsing fails, return helpful error to client.
-            return jsonify({"error": "Invalid datetime format. Use ISO 8601 format"}), 400  # Bad request response.
-
-        # Create new log entry  # Build a new SensorData object with casted numeric types.
-        new_log = SensorData(
-            datetime=dt,  # Assign parsed datetime to model field.
-            steps=int(steps) if steps is not None else None,  # Convert steps to int if provided else None.
-            raw_voltage=float(raw_voltage) if raw_voltage is not None else None,  # Convert voltage to float or None.
-            raw_current=float(raw_current) if raw_current is not None else None,  # Convert current to float or None.
-            battery_health=float(battery_health) if battery_health is not None else None  # Convert battery health to float or None.
-        )  # End construction of SensorData instance.
+        # Detect if request is JSON or form  # JSON body and request.form both expose .get().
+        data = request.get_json(silent=True) if request.is_json else request.form  # Parse JSON payload or use form mapping.
+        if data is None or (request.is_json and not isinstance(data, dict)):  # Malformed JSON, or a bare string/number.
+            return jsonify({"error": "Expected a JSON object or array of logs"}), 400  # Bad request response.
+
+        try:  # Validate and convert the payload fields.
+            fields = build_log_mapping(data)  # Raises ValueError on bad datetime or numbers.
+        except ValueError as e:  # If parsing fails, return helpful error to client.
+            return jsonify({"error": str(e)}), 400  # Bad request response.
+
+        new_log = SensorData(**fields)  # Build a new SensorData object from the validated values.
 
         db.session.add(new_log)  # Add the created model object to the DB session.
+        record_daily_summary([fields])  # Update the day's totals in the same transaction.
         db.session.commit()  # Commit to persist row in database.
 
-        # Invalidate forecast cache  # Important: new raw data may change forecasts.
-        forecast_cache["date"] = None  # Reset cached forecast date to force recompute on next request.
+        # Invalidate derived caches  # Important: new raw data may change forecasts, counts and charts.
+        invalidate_sensor_caches()  # Forecast, log counts and chart aggregates are recomputed on demand.
 
         # Return based on request type  # Respond differently for API vs form clients.
         if request.is_json:  # For JSON clients return a JSON success message with 201 status.
@@ -391,13 +1126,45 @@ def add_log():  # Handler to create a new SensorData record from incoming payloa
         else:  # For form clients redirect back to the dashboard page (human flow).
             return redirect(url_for("sensor_dashboard"))
 
-    except Exception as e:  # On any exception, attempt to rollback DB and return helpful error.
+    except Exception:  # On any exception, attempt to rollback DB and return a generic error.
         db.session.rollback()  # Revert any partial DB changes.
+        app.logger.exception("Failed to log sensor data")  # Details go to the server log, not the client.
         if request.is_json:  # For API clients return JSON error payload.
-            return jsonify({"error": f"Failed to log data: {str(e)}"}), 500
-        return f"<h3>Failed to log data: {e}</h3>", 500  # For HTML flow return simple error page.
+            return jsonify({"error": "Failed to log data"}), 500
+        return "<h3>Failed to log data</h3>", 500  # For HTML flow return simple error page.
+
+@app.route("/api/v1/add-logs", methods=["POST"])  # Batch ingestion endpoint for devices that buffer readings.
+def api_add_logs():  # Handler inserting many SensorData rows in one executemany.
+    """
+    Batch variant of /add-log. Accepts a JSON array of log objects (same fields as /add-log)
+    and inserts them with a single bulk INSERT and one commit. /add-log forwards JSON arrays here.
+    The whole batch is rejected if any entry is invalid.
+    """ 
+    data = request.get_json(silent=True)  # Parse JSON body; None when body is not valid JSON.
+    if not isinstance(data, list) or not data:  # Require a non-empty array.
+        return jsonify({"error": "Expected a non-empty JSON array of logs"}), 400  # Bad request response.
+
+    rows = []  # Validated column mappings for bulk insert.
+    for index, entry in enumerate(data):  # Validate every entry before touching the DB.
+        if not isinstance(entry, dict):  # Each entry must be a JSON object.
+            return jsonify({"error": f"Entry {index}: expected a JSON object"}), 400  # Report offending index.
+        try:
+            rows.append(build_log_mapping(entry))  # Convert entry to column values.
+        except ValueError as e:  # Bad datetime or numeric field.
+            return jsonify({"error": f"Entry {index}: {e}"}), 400  # Report offending index and reason.
+
+    try:  # Insert the whole batch in one transaction.
+        db.session.execute(insert(SensorData), rows)  # Bulk INSERT batched into multi-row VALUES (insertmanyvalues); no ORM objects.
+        record_daily_summary(rows)  # One upsert per affected day, same transaction.
+        db.session.commit()  # One commit for the whole batch.
+    except Exception:  # On DB failure roll back the whole batch.
+        db.session.rollback()  # Revert partial inserts.
+        app.logger.exception("Failed to log sensor data batch")  # Details go to the server log, not the client.
+        return jsonify({"error": "Failed to log data"}), 500  # Internal error response.
+
+    invalidate_sensor_caches()  # Invalidate derived caches once per batch, not per row.
+    return jsonify({"message": "Sensor data logged successfully", "count": len(rows)}), 201  # Created response with row count.
 
-    
 @app.route("/download-csv")  # Route for exporting sensor logs in CSV format (web-only).
 def download_csv():  # Download handler that accepts start and end YYYY-MM query params.
     """
@@ -420,28 +1187,16 @@ def download_csv():  # Download handler that accepts start and end YYYY-MM query
         return "Start month must be before end month", 400  # Return bad request for inverted range.
 
     # Query logs for the inclusive start-end month range  # Comment about range computation below.
-    logs = SensorData.query.filter(
+    logs = db.session.query(  # Select only the exported columns so no ORM objects are built per row.
+        SensorData.id,  # Unique record identifier.
+        SensorData.steps,  # Steps value.
+        SensorData.raw_voltage,  # Raw voltage reading.
+        SensorData.raw_current,  # Raw current reading.
+        SensorData.datetime  # Timestamp of the reading.
+    ).filter(
         SensorData.datetime >= start_date,  # Include any datetime on/after the start-of-start-month.
-        SensorData.datetime < (end_date.replace(day=28) + timedelta(days=4)).replace(day=1)  # Compute first day of month after end_date to make range inclusive.
-    ).all()  # Execute query and fetch rows.
-
-    # Build CSV  # Use StringIO and csv.writer to stream CSV contents into a buffer.
-    string_buffer = StringIO()  # Create text buffer for CSV writing.
-    writer = csv.writer(string_buffer)  # CSV writer that will write into the text buffer.
-    writer.writerow(['ID', 'Steps', 'Raw Voltage', 'Raw Current', 'Datetime'])  # Write header row.
-
-    for log in logs:  # Iterate over fetched logs to append CSV rows.
-        writer.writerow([  # Write each log as a row in the CSV.
-            log.id,  # Unique record identifier.
-            log.steps,  # Steps value for that record.
-            log.raw_voltage,  # Raw voltage reading.
-            log.raw_current,  # Raw current reading.
-            log.datetime.strftime('%Y-%m-%d %H:%M:%S')  # Format datetime field for CSV readability.
-        ])  # End of writer.writerow call for each log.
-
-    byte_buffer = BytesIO()  # Create a byte buffer to serve the CSV as downloadable file.
-    byte_buffer.write(string_buffer.getvalue().encode('utf-8'))  # Encode string buffer to bytes and write.
-    byte_buffer.seek(0)  # Rewind to the beginning for send_file consumption.
+        SensorData.datetime < _next_month(end_date)  # Half-open upper bound: first day of the month after end_date.
+    ).execution_options(stream_results=True, yield_per=1000)  # Use a server-side cursor and fetch in batches of 1000 rows.
 
     # Filename  # Build a human-friendly filename based on the requested months.
     start_month_name = calendar.month_name[start_date.month]  # Human month name for start.
@@ -453,12 +1208,19 @@ def download_csv():  # Download handler that accepts start and end YYYY-MM query
         else f"Sensor_Data_Report({year}_{start_month_name}-{end_month_name}).csv"
     )  # End filename computation.
 
-    return send_file(  # Use Flask's send_file to serve the CSV as an attachment.
-        byte_buffer,  # Byte buffer containing encoded CSV.
-        mimetype='text/csv',  # MIME type for CSV files.
-        as_attachment=True,  # Force download behavior in browsers.
-        download_name=filename  # Suggested filename for the browser download dialog.
-    )  # End of send_file invocation.
+    return stream_csv(  # Stream rows to the client as they are read from the database.
+        ['ID', 'Steps', 'Raw Voltage', 'Raw Current', 'Datetime'],  # Header row.
+        (  # Lazily map each log to a CSV row.
+            (
+                log_id,  # Unique record identifier.
+                steps,  # Steps value for that record.
+                raw_voltage,  # Raw voltage reading.
+                raw_current,  # Raw current reading.
+                _fmt_dt(log_datetime)  # Format datetime field for CSV readability.
+            ) for log_id, steps, raw_voltage, raw_current, log_datetime in logs  # Unpack plain row tuples from the streamed cursor.
+        ),
+        filename  # Suggested filename for the browser download dialog.
+    )  # End of stream_csv invocation.
 
 
 # ==========================
@@ -472,7 +1234,6 @@ def sensor_dashboard():  # Dashboard view building metrics, charts, and paginate
     Original web UI dashboard route.
     Uses the shared helper functions to build all metrics and chart data.
     """  
-    now = datetime.now()  # Capture current server time for filters and forecast date.
     per_page = 10  # Default page size for tables in UI.
     chart_days_per_page = 7  # Default number of days shown on chart pagination.
 
@@ -480,121 +1241,84 @@ def sensor_dashboard():  # Dashboard view building metrics, charts, and paginate
     filter_type = request.args.get("filter")  # Optional filter type: day|week|month used by UI.
     month_filter = request.args.get("month")  # Optional explicit month filter YYYY-MM used by UI.
     export_type = request.args.get("export")  # Export trigger param to produce CSV download.
-    sensor_page = request.args.get("page", 1, type=int)  # Sensor logs page number with default.
     summary_page = request.args.get("summary_page", 1, type=int)  # Summary table page number with default.
-    chart_page = request.args.get("chart_page", 1, type=int)  # Chart pagination page number with default.
+    chart_page = max(request.args.get("chart_page", 1, type=int), 1)  # Chart pagination page number (SQL OFFSET cannot be negative).
 
     # --- Time Filter Calculation ---  # Compute start_time and end_time based on filters to re-use in queries.
-    if month_filter:  # If specific month provided in format YYYY-MM compute start and end of that month.
-        try:
-            year, month = map(int, month_filter.split("-"))  # Parse year and month integers from month_filter.
-            start_time = datetime(year, month, 1)  # Start at first day of requested month.
-            end_time = datetime(year + 1, 1, 1) if month == 12 else datetime(year, month + 1, 1)  # Compute exclusive end boundary.
-        except ValueError:
-            start_time = end_time = None  # If parsing fails, treat as no filter.
-    elif filter_type == "day":  # If filter=day consider today starting at midnight.
-        start_time = now.replace(hour=0, minute=0, second=0, microsecond=0)  # Midnight today as lower bound.
-        end_time = None  # No exclusive end - will use get_sensor_query behavior.
-    elif filter_type == "week":  # If filter=week consider the start of current week (Mon) as lower bound.
-        start_time = now - timedelta(days=now.weekday())  # Compute Monday of current week.
-        end_time = None  # No exclusive end.
-    elif filter_type == "month":  # If filter=month consider the start of current month as lower bound.
-        start_time = now.replace(day=1, hour=0, minute=0, second=0, microsecond=0)  # First day of month at midnight.
-        end_time = None  # No exclusive end.
-    else:  # Default: no time filtering.
-        start_time = end_time = None  # No filters applied.
+    start_time, end_time = _parse_time_window(request.args)  # Shared month/day/week/month parsing.
 
     # --- Query SensorData ---  # Build query using shared helper to ensure consistent behavior across UI/API.
     sensor_query = get_sensor_query(start_time, end_time)  # Use helper to prepare base sensor query.
 
     # --- Export Sensor Data (Web-only) ---  # If export parameter is set, produce CSV of raw sensor logs.
     if export_type == "sensor":  # Export raw sensor logs CSV.
-        output = StringIO()  # Text buffer for CSV streaming.
-        writer = csv.writer(output)  # CSV writer over text buffer.
-        writer.writerow(["ID", "Datetime", "Steps", "Voltage", "Current"])  # Header row for export.
-        for row in sensor_query.all():  # Iterate all matching sensor rows (careful: could be many).
-            writer.writerow([row.id, row.datetime, row.steps, row.raw_voltage, row.raw_current])  # Write each record.
-        output.seek(0)  # Rewind buffer for send_file.
-        return send_file(output, mimetype='text/csv', as_attachment=True, download_name='sensor_logs.csv')  # Serve CSV.
+        return stream_csv(  # Stream rows in batches rather than loading every matching log.
+            ["ID", "Datetime", "Steps", "Voltage", "Current"],  # Header row for export.
+            sensor_query.yield_per(1000),  # Column rows already match the header order; batched fetch.
+            'sensor_logs.csv'  # Download filename.
+        )  # Serve CSV.
 
     # --- Summary Aggregation (Daily) ---  # Prepare daily summary aggregates using shared helper.
     summary_query = get_summary_query(start_time, end_time)  # Get aggregated daily summaries.
 
     # --- Export Summary Data (Web-only) ---  # If export=summary create CSV for daily aggregates.
     if export_type == "summary":  # Export aggregated summary CSV.
-        output = StringIO()  # Text buffer for CSV.
-        writer = csv.writer(output)  # CSV writer instance.
-        writer.writerow(["Date", "Total Steps", "Total Voltage", "Total Current"])  # Header for summary CSV.
-        for row in summary_query.all():  # Iterate aggregated rows.
-            writer.writerow([row.date, row.total_steps, row.total_voltage, row.total_current])  # Write each aggregated row.
-        output.seek(0)  # Rewind buffer for send_file.
-        return send_file(output, mimetype='text/csv', as_attachment=True, download_name='summary_logs.csv')  # Serve CSV.
-
-    # --- Paginate Sensor Logs ---  # Compute paging values used by template to show sensor logs table.
-    total_sensor_logs = sensor_query.count()  # Count total logs matching filter for pagination math.
-    sensor_data = sensor_query.offset((sensor_page - 1) * per_page).limit(per_page).all()  # Slice results for current page.
-    total_sensor_pages = ceil(total_sensor_logs / per_page) if total_sensor_logs else 1  # Compute total pages defaulting to 1.
-
-    # --- Metrics ---  # Compute aggregated metrics for the dashboard cards using summary_query results.
-    summary_data_all = summary_query.all()  # Fetch all aggregated summary rows for computing metrics.
-    count = len(summary_data_all) or 1  # Use count or 1 to avoid zero-division when computing averages.
-
-    total_steps = sum(d.total_steps for d in summary_data_all)  # Total steps across period (safe when values None? model should store numbers).
-    total_voltage = sum(d.total_voltage for d in summary_data_all)  # Total summed voltage across period.
-    total_current = sum(d.total_current for d in summary_data_all)  # Total summed current across period.
-
-    avg_steps = total_steps / count  # Average steps per day computed from summaries.
-    avg_voltage = total_voltage / count  # Average voltage per day.
-    avg_current = total_current / count  # Average current per day.
-
-    max_steps = max((d.total_steps for d in summary_data_all), default=0)  # Max daily steps with default fallback.
-    max_voltage = max((d.total_voltage for d in summary_data_all), default=0)  # Max daily voltage fallback.
-    max_current = max((d.total_current for d in summary_data_all), default=0)  # Max daily current fallback.
-
-    min_steps = min((d.total_steps for d in summary_data_all), default=0)  # Min daily steps fallback.
-    min_voltage = min((d.total_voltage for d in summary_data_all), default=0)  # Min daily voltage fallback.
-    min_current = min((d.total_current for d in summary_data_all), default=0)  # Min daily current fallback.
+        return stream_csv(  # Stream the per-day rows as they are fetched.
+            ["Date", "Total Steps", "Total Voltage", "Total Current"],  # Header for summary CSV.
+            summary_query.yield_per(1000),  # (date, steps, voltage, current) rows match the header; batched fetch.
+            'summary_logs.csv'  # Download filename.
+        )  # Serve CSV.
+
+    # --- Metrics ---  # Aggregate the daily totals in SQL (cached briefly); only one row is transferred.
+    stats, total_summary_days, summary_data = get_dashboard_summary(  # Metrics, day count and the summary table page.
+        start_time, end_time, per_page, max(summary_page, 1)  # Clamp page < 1 to the first page, as paginate(error_out=False) did.
+    )  # End summary fetch.
+
+    total_steps = stats["total_steps"]  # Total steps across period (0 when no data).
+    total_voltage = stats["total_voltage"]  # Total summed voltage across period.
+    total_current = stats["total_current"]  # Total summed current across period.
+
+    avg_steps = stats["avg_steps"]  # Average steps per day.
+    avg_voltage = stats["avg_voltage"]  # Average voltage per day.
+    avg_current = stats["avg_current"]  # Average current per day.
+
+    max_steps = stats["max_steps"]  # Max daily steps with default fallback.
+    max_voltage = stats["max_voltage"]  # Max daily voltage fallback.
+    max_current = stats["max_current"]  # Max daily current fallback.
+
+    min_steps = stats["min_steps"]  # Min daily steps fallback.
+    min_voltage = stats["min_voltage"]  # Min daily voltage fallback.
+    min_current = stats["min_current"]  # Min daily current fallback.
 
     # --- Forecast Update ---  # Update forecast cache if stale for today.
-    if forecast_cache["date"] != datetime.now().date():  # If cache not updated today then update.
-        update_forecast_cache()  # Recompute forecasts and update cache.
-    # Cross-platform day formatting  # Attempt platform-dependent strftime format then fallback to portable variant.
-    try:
-        forecast_date = (datetime.now() + timedelta(days=1)).strftime("%B %-d, %Y")  # Preferred format with no zero-padding on day (POSIX).
-    except ValueError:
-        forecast_date = (datetime.now() + timedelta(days=1)).strftime("%B %d, %Y")  # Windows-safe fallback using %d.
+    today = datetime.now().date()  # Read the clock once for the staleness check and the forecast date.
+    refresh_forecast_if_stale(today)  # Single-flight refresh; concurrent requests use the cached values.
+    forecast_date = forecast_date_label(today)  # Memoized per day.
 
     # --- Chart Pagination ---  # Build time-series chart slices for the frontend from daily aggregates.
-    chart_query = get_chart_query()  # Query for chart-friendly daily aggregates.
-    daily_aggregates = chart_query.all()  # Fetch all daily aggregate tuples.
-    total_chart_pages = ceil(len(daily_aggregates) / chart_days_per_page) if daily_aggregates else 1  # Total chart pages.
-    paginated_chart_data = daily_aggregates[  # Slice for requested chart page and reverse to chronological order.
-        (chart_page - 1) * chart_days_per_page : chart_page * chart_days_per_page
-    ][::-1]  # Reverse slice so earliest date is first on chart for better UX.
-
-    chart_labels = [d[0].strftime("%b %d") for d in paginated_chart_data]  # Build human-friendly labels like 'Sep 01'.
-    voltage_chart = [round(d[1], 2) for d in paginated_chart_data]  # Round voltage values for chart presentation.
-    current_chart = [round(d[2], 2) for d in paginated_chart_data]  # Round current values for chart presentation.
-    steps_chart = [d[3] for d in paginated_chart_data]  # Steps series (already integer sums).
-
-    # --- Best Month Predictions ---  # Use monthly prediction helper to get best month for voltage/current.
-    best_voltage_month, best_voltage_value = predict_highest_month("raw_voltage")  # Predict best month by voltage.
-    best_current_month, best_current_value = predict_highest_month("raw_current")  # Predict best month by current.
+    paginated_chart_data, total_chart_pages = get_chart_page(  # Cached SQL-paged window of daily aggregates.
+        chart_days_per_page, chart_page,
+        days=total_summary_days if start_time is None else None  # Unfiltered view: the metrics query already counted every day.
+    )  # End chart page fetch.
+
+    chart_series = build_chart_series(paginated_chart_data)  # Vectorized labels/series for the current chart page.
+
+    # --- Best Month Predictions ---  # Read best-month predictions computed alongside the daily forecast.
+    forecast = forecast_cache.copy()  # One consistent snapshot (the worker may publish mid-request).
+    best_voltage_month = forecast["best_voltage_month"]  # Cached best month by voltage.
+    best_voltage_value = forecast["best_voltage_value"]  # Cached best voltage value.
+    best_current_month = forecast["best_current_month"]  # Cached best month by current.
+    best_current_value = forecast["best_current_value"]  # Cached best current value.
     if best_voltage_month is None or best_current_month is None:  # If either prediction unavailable due to insufficient history:
         monthly_forecast_message = "Not enough historical data for monthly forecast. Please collect more data."  # Informative message for UI.
     else:
         monthly_forecast_message = None  # Clear message when predictions exist.
 
-    # --- Paginate Summary Table ---  # Use Flask-SQLAlchemy pagination utility for summary table view.
-    paginated_summary = summary_query.paginate(page=summary_page, per_page=per_page, error_out=False)  # Paginate summary query safely.
-    summary_data = paginated_summary.items  # Current page items to pass to template.
-    total_summary_pages = paginated_summary.pages  # Total summary pages computed by paginate.
-    show_summary_pagination = paginated_summary.total > per_page  # Decide whether to show pagination controls.
+    # --- Paginate Summary Table ---  # Page rows came with the metrics; the day count replaces a separate COUNT.
+    total_summary_pages = ceil(total_summary_days / per_page)  # Total summary pages (0 when there is no data, like paginate).
+    show_summary_pagination = total_summary_days > per_page  # Decide whether to show pagination controls.
 
     return render_template("sensor_dashboard.html",  # Render the dashboard template with computed context.
-        sensor_data=sensor_data,  # Raw sensor logs for current page.
-        page=sensor_page,  # Current sensor page index.
-        total_pages=total_sensor_pages,  # Total pages for sensor logs.
         filter=filter_type,  # Current filter type for UI state.
         month_filter=month_filter,  # Current month filter string for UI.
 
@@ -612,20 +1336,20 @@ def sensor_dashboard():  # Dashboard view building metrics, charts, and paginate
         min_current=min_current,  # Minimum daily current across period.
 
         forecast_date=forecast_date,  # Human-friendly forecast date string for UI.
-        forecast_voltage=forecast_cache["voltage"],  # Cached numeric forecast voltage.
-        forecast_current=forecast_cache["current"],  # Cached numeric forecast current.
-        predicted_voltage=forecast_cache["voltage"],  # Alias maintained for template compatibility.
-        predicted_current=forecast_cache["current"],  # Alias maintained for template compatibility.
+        forecast_voltage=forecast["voltage"],  # Cached numeric forecast voltage.
+        forecast_current=forecast["current"],  # Cached numeric forecast current.
+        predicted_voltage=forecast["voltage"],  # Alias maintained for template compatibility.
+        predicted_current=forecast["current"],  # Alias maintained for template compatibility.
         best_voltage_month=best_voltage_month,  # Best voltage month string or None.
         best_voltage_value=best_voltage_value,  # Corresponding numeric value for best voltage month.
         best_current_month=best_current_month,  # Best current month string or None.
         best_current_value=best_current_value,  # Corresponding numeric value for best current month.
         monthly_forecast_message=monthly_forecast_message,  # Display message when monthly prediction unavailable.
 
-        chart_labels=chart_labels,  # Labels list for chart X axis.
-        voltage_chart=voltage_chart,  # Voltage series data for chart.
-        current_chart=current_chart,  # Current series data for chart.
-        steps_chart=steps_chart,  # Steps series data for chart.
+        chart_labels=chart_series["labels"],  # Labels list for chart X axis.
+        voltage_chart=chart_series["voltage"],  # Voltage series data for chart.
+        current_chart=chart_series["current"],  # Current series data for chart.
+        steps_chart=chart_series["steps"],  # Steps series data for chart.
         chart_page=chart_page,  # Current chart pagination page.
         total_chart_pages=total_chart_pages,  # Total pages available for chart pagination.
 
@@ -645,75 +1369,65 @@ def api_sensor_data():  # Handler returning paginated JSON logs with optional ti
     """
     Return paginated raw sensor logs as JSON.
     Query params:
-      - page (int)
-      - per_page (int)
+      - cursor (str): `next_cursor` from the previous response (keyset pagination, preferred)
+      - page (int): page number, used only when no cursor is given
+      - per_page (int): 1 to API_MAX_PER_PAGE, larger values are clamped
       - filter (day|week|month) or month=YYYY-MM for month selection
     """  
-    now = datetime.now()  # Current time used for relative filters.
-    per_page = request.args.get("per_page", 10, type=int)  # Per-page param with default and type coercion.
+    per_page = min(max(request.args.get("per_page", 10, type=int), 1), API_MAX_PER_PAGE)  # Per-page param, clamped to 1..API_MAX_PER_PAGE.
     page = request.args.get("page", 1, type=int)  # Page param with default and type coercion.
+    cursor = request.args.get("cursor")  # Keyset cursor from a previous response's next_cursor.
 
     # Time filtering logic mirrors the web UI  # Keep logic consistent across UI and API.
-    filter_type = request.args.get("filter")  # Optional filter param similar to web UI.
-    month_filter = request.args.get("month")  # Optional explicit month filter YYYY-MM.
+    start_time, end_time = _parse_time_window(request.args)  # Shared month/day/week/month parsing.
 
-    if month_filter:  # Month-specific filter parsing.
-        try:
-            year, month = map(int, month_filter.split("-"))  # Parse year/month.
-            start_time = datetime(year, month, 1)  # Start boundary inclusive.
-            end_time = datetime(year + 1, 1, 1) if month == 12 else datetime(year, month + 1, 1)  # Exclusive end boundary.
-        except ValueError:
-            start_time = end_time = None  # Fallback when parsing fails.
-    elif filter_type == "day":  # Day filter -> from midnight today.
-        start_time = now.replace(hour=0, minute=0, second=0, microsecond=0)  # Today's midnight.
-        end_time = None  # No explicit end bound.
-    elif filter_type == "week":  # Week filter -> from Monday of this week.
-        start_time = now - timedelta(days=now.weekday())  # Start of week.
-        end_time = None  # No explicit end bound.
-    elif filter_type == "month":  # Month filter -> from first day of current month.
-        start_time = now.replace(day=1, hour=0, minute=0, second=0, microsecond=0)  # Start of month.
-        end_time = None  # No explicit end bound.
-    else:
-        start_time = end_time = None  # No filtering if no filter params provided.
+    logs, next_cursor, total_logs = get_sensor_page_with_total(  # Keyset page when a cursor is given; total in the same round trip.
+        start_time, end_time, per_page, page=page, cursor=cursor
+    )  # End page fetch.
+    prefetch_sensor_page(start_time, end_time, per_page, next_cursor)  # Warm the following page while the client reads this one.
 
-    sensor_query = get_sensor_query(start_time, end_time)  # Compose base sensor query with the computed filters.
-    total_logs = sensor_query.count()  # Compute total number of logs for pagination metadata.
-    logs = sensor_query.offset((page - 1) * per_page).limit(per_page).all()  # Fetch logs for requested page slice.
-
-    return jsonify({  # Build JSON response including metadata and records list.
-        "page": page,  # Current page number.
+    payload = {  # Paging metadata; the logs are added below.
         "per_page": per_page,  # Number of entries per page.
-        "total_pages": ceil(total_logs / per_page) if total_logs else 1,  # Compute total pages with fallback.
         "total_logs": total_logs,  # Total matching log count.
-        "logs": [  # List of log objects converted to JSON-serializable primitives.
-            {
-                "id": r.id,  # Record id.
-                "datetime": r.datetime.strftime("%Y-%m-%d %H:%M:%S"),  # Datetime string for client display.
-                "steps": r.steps,  # Steps integer value.
-                "voltage": r.raw_voltage,  # Raw voltage float or None.
-                "current": r.raw_current  # Raw current float or None.
-            } for r in logs  # Comprehension to build JSON list from ORM objects.
-        ]
-    })  # Return JSON response for API clients.
+        "next_cursor": next_cursor,  # Pass as ?cursor= to fetch the following page; None on the last page.
+        "has_next": next_cursor is not None  # Convenience flag for clients.
+    }  # End metadata.
+    if not parse_sensor_cursor(cursor):  # Page numbers only mean something for page-number requests.
+        payload["page"] = page  # Current page number.
+        payload["total_pages"] = ceil(total_logs / per_page) if total_logs else 1  # Compute total pages with fallback.
+
+    payload["logs"] = [  # List of log objects converted to JSON-serializable primitives.
+        {
+            "id": log_id,  # Record id.
+            "datetime": _fmt_dt(log_datetime),  # Datetime string for client display.
+            "steps": steps,  # Steps integer value.
+            "voltage": raw_voltage,  # Raw voltage float or None.
+            "current": raw_current  # Raw current float or None.
+        } for log_id, log_datetime, steps, raw_voltage, raw_current, *_ in logs  # Unpack column rows (ignores the optional _total).
+    ]
+    return jsonify(payload)  # Return JSON response for API clients.
 
 @app.route("/api/v1/forecast")  # API endpoint returning forecast cache and monthly predictions.
 @api_login_required  # Require authenticated API session.
 def api_forecast():  # Handler that returns cached forecast data and monthly predictions.
     """
     Returns the current forecast cache and best-month predictions for voltage & current.
-    If cache is stale for today, recompute first.
+    If cache is stale for today, recompute first (all values come from forecast_cache).
     Includes a message when there isn't enough historical data for monthly forecast.
     """  # Docstring explaining recompute-on-stale and message behavior.
     # Recompute if cache is stale
-    if forecast_cache["date"] != datetime.now().date():  # If cache date isn't today, refresh.
-        update_forecast_cache()  # Recompute and populate forecast_cache.
-    # Compute best months for voltage & current
-    best_voltage_month, best_voltage_value = predict_highest_month("raw_voltage")  # Monthly best for voltage.
-    best_current_month, best_current_value = predict_highest_month("raw_current")  # Monthly best for current.
+    today = datetime.now().date()  # Read the clock once for the staleness check and the forecast date.
+    refresh_forecast_if_stale(today)  # Single-flight refresh; concurrent requests use the cached values.
+    # Best months are computed with the daily forecasts; just read them from the cache.
+    forecast = forecast_cache.copy()  # One consistent snapshot (the worker may publish mid-request).
+    best_voltage_month = forecast["best_voltage_month"]  # Monthly best for voltage.
+    best_voltage_value = forecast["best_voltage_value"]  # Predicted average for that month.
+    best_current_month = forecast["best_current_month"]  # Monthly best for current.
+    best_current_value = forecast["best_current_value"]  # Predicted average for that month.
     response = {  # Build JSON response dict with forecast and predictions.
-        "forecast_date": (datetime.now() + timedelta(days=1)).strftime("%B %d, %Y"),  # Human-readable next-day date string.
-        "forecast_voltage": forecast_cache.get("voltage"),  # Cached voltage forecast numeric value.
-        "forecast_current": forecast_cache.get("current"),  # Cached current forecast numeric value.
+        "forecast_date": forecast_date_label(today, padded=True),  # Human-readable next-day date string (memoized per day).
+        "forecast_voltage": forecast["voltage"],  # Cached voltage forecast numeric value.
+        "forecast_current": forecast["current"],  # Cached current forecast numeric value.
         "best_voltage_month": best_voltage_month,  # Best voltage month string or None.
         "best_voltage_value": best_voltage_value,  # Numeric best voltage prediction or None.
         "best_current_month": best_current_month,  # Best current month string or None.
@@ -721,25 +1435,35 @@ def api_forecast():  # Handler that returns cached forecast data and monthly pre
     }  # End of response dictionary.
     if best_voltage_month is None or best_current_month is None:  # If predictions couldn't be computed:
         response["message"] = "Not enough historical data for monthly forecast. Please collect more data."  # Helpful message.
-    return jsonify(response)  # Return JSON response to client.
+    return cacheable_json_response(app.json.dumps(response).encode("utf-8"))  # JSON with ETag / Cache-Control (304 on match).
+
+# Single-cell Li-ion open-circuit voltage -> state of charge, piecewise linear between points.  # Discharge curve is flat mid-range.
+BATTERY_VOLTAGE_TABLE = np.array([3.0, 3.3, 3.5, 3.7, 3.85, 4.0, 4.2])  # Volts, ascending (np.interp requirement).
+BATTERY_PERCENT_TABLE = np.array([0.0, 10.0, 30.0, 50.0, 70.0, 90.0, 100.0])  # Charge percentage at each voltage.
+
+def battery_voltage_to_percent(voltage):  # Estimate battery charge from its voltage.
+    """
+    Interpolate the Li-ion discharge curve above; readings outside 3.0-4.2 V clamp to 0 / 100 %.
+    """  
+    return float(np.interp(voltage, BATTERY_VOLTAGE_TABLE, BATTERY_PERCENT_TABLE))  # Branch-free table lookup.
 
 @app.route("/api/v1/battery-health", methods=["GET"])  # API endpoint to fetch latest battery health reading and percentage.
 def api_get_battery_health():  # Handler to return battery health information from latest record.
     try:  # Wrap DB access in try/except to return consistent error responses on failure.
         # Get the latest record with a battery_health value  # We want the most recent non-null battery_health row.
         latest_record = (
-            SensorData.query
+            db.session.query(SensorData.datetime, SensorData.battery_health)  # Both columns live in ix_sensor_datetime_id_battery.
             .filter(SensorData.battery_health.isnot(None))
             .order_by(SensorData.datetime.desc())
             .first()
-        )  # Execute query returning the most recent row that has battery_health not null.
+        )  # Backward index-only scan to the most recent row that has battery_health not null.
 
         if not latest_record:  # If no record found return 404.
             return jsonify({"error": "No battery health data found"}), 404  # Not found response.
 
-        # Convert battery health to percentage  # Convert voltage to an approximate percentage of 4.2V full-scale.
+        # Convert battery health to percentage  # Map the voltage onto the Li-ion discharge curve.
         battery_voltage = latest_record.battery_health  # Extract raw battery voltage from record.
-        battery_percentage = (battery_voltage / 4.2) * 100  # Simple linear mapping to percentage (assumes 4.2V = 100%).
+        battery_percentage = battery_voltage_to_percent(battery_voltage)  # Piecewise-linear state of charge (0-100 %).
 
         return jsonify({  # Return structured JSON payload with timestamp, voltage, and percentage.
             "datetime": latest_record.datetime.isoformat(),  # ISO-formatted timestamp.
@@ -762,11 +1486,11 @@ def _map_summary_to_frontend_shape(paginated):  # Helper that maps Flask-SQLAlch
     return {  # Return dictionary in shape expected by front-end code.
         "entries": [  # Map each paginated row to a JSON-friendly dict with consistent types/formats.
             {
-                "date": row.date.strftime("%Y-%m-%d"),  # ISO-like date format for the front-end.
-                "total_steps": int(row.total_steps or 0),  # Ensure numeric integer output not None.
-                "total_voltage": f"{float(row.total_voltage or 0.0):.2f}",  # Format voltage with two decimal places as string.
-                "total_current": f"{float(row.total_current or 0.0):.2f}",  # Format current with two decimal places as string.
-            } for row in paginated.items  # Iterate current page items returned by paginate.
+                "date": day.isoformat(),  # ISO date (YYYY-MM-DD) for the front-end.
+                "total_steps": int(steps),  # Integer steps (COALESCEd to 0 in SQL).
+                "total_voltage": f"{voltage:.2f}",  # Format voltage with two decimal places as string.
+                "total_current": f"{current:.2f}",  # Format current with two decimal places as string.
+            } for day, steps, voltage, current in paginated.items  # Unpack plain summary tuples.
         ],
         "current_page": paginated.page,  # Current page number from paginate object.
         "total_pages": paginated.pages or 1  # Total pages or 1 fallback for edge cases.
@@ -779,24 +1503,12 @@ def chart_data_alias():  # Handler that mirrors API chart data shape for the fro
     Same-origin alias for AJAX in the dashboard.
     Mirrors /api/v1/chart-data output exactly so the front-end can call /api/chart-data.
     """  
-    chart_days_per_page = request.args.get("days_per_page", 7, type=int)  # Configurable number of days per chart page.
-    chart_page = request.args.get("chart_page", 1, type=int)  # Chart pagination page number.
-
-    chart_query = get_chart_query()  # Reuse shared chart query builder.
-    daily_aggregates = chart_query.all()  # Fetch all aggregates to allow pagination slicing in Python.
-    total_chart_pages = ceil(len(daily_aggregates) / chart_days_per_page) if daily_aggregates else 1  # Compute number of chart pages.
-    paginated_chart_data = daily_aggregates[  # Slice the aggregates to the requested page and reverse to chronological.
-        (chart_page - 1) * chart_days_per_page : chart_page * chart_days_per_page
-    ][::-1]  # Reverse slice so the earliest date in the selection is first on the chart.
-
-    return jsonify({  # Return JSON matching front-end expectations: labels and series arrays.
-        "labels": [d[0].strftime("%b %d") for d in paginated_chart_data],  # Human-friendly X axis labels for chart.
-        "voltage": [round(d[1], 2) for d in paginated_chart_data],  # Voltage series rounded to 2 decimals.
-        "current": [round(d[2], 2) for d in paginated_chart_data],  # Current series rounded to 2 decimals.
-        "steps": [int(d[3] or 0) for d in paginated_chart_data],  # Steps series coerced to int with fallback 0.
-        "total_pages": total_chart_pages,  # Total pages for chart pagination controls.
-        "current_page": chart_page  # Current page index for UI.
-    })  # End jsonify.
+    chart_days_per_page = max(request.args.get("days_per_page", 7, type=int), 1)  # Configurable number of days per chart page.
+    chart_page = max(request.args.get("chart_page", 1, type=int), 1)  # Chart pagination page number (SQL OFFSET cannot be negative).
+
+    return cacheable_json_response(  # Send the cached, pre-serialized body with ETag / Cache-Control.
+        get_chart_payload(chart_days_per_page, chart_page)  # labels / series / total_pages / current_page.
+    )  # 304 when the browser already has it.
 
 # ==========================  
 # === API Authentication ===  
@@ -815,8 +1527,8 @@ def api_login():  # Handler that authenticates user and sets session cookie for
     if not username or not password:  # Validate presence of credentials.
         return jsonify({"error": "Missing username or password"}), 400  # Bad request response.
 
-    user = User.query.filter_by(username=username).first()  # Lookup user record by username.
-    if user and user.check_password(password):  # Validate provided password using model helper.
+    user = get_user_credentials(username)  # Cached (id, password hash) lookup by username.
+    if verify_password(user, password):  # Validate provided password on the bcrypt pool.
         session["user_id"] = user.id  # Set user id into session to mark authenticated user.
         return jsonify({"status": "success", "user_id": user.id})  # Return success response with user id.
     return jsonify({"error": "Invalid credentials"}), 401  # Unauthorized response on failure.
@@ -841,6 +1553,10 @@ def handshake():  # Handler that returns JSON success or error message.
 # ===================== 
 
 if __name__ == "__main__":  # Module entrypoint when run as main script (development use).
-    # Start background forecast updater thread  # Kick off background retraining/updating as daemon.
-    threading.Thread(target=retrain_forecast_models, daemon=True).start()  # Spawn daemon thread for daily cache refresh.
-    app.run(host="0.0.0.0", debug=True)  # Start Flask built-in server listening on all interfaces with debug enabled.
+    initialize_database()  # Create any missing tables once before serving.
+    debug = True  # Development server with the auto-reloader.
+    if debug:  # app.run(debug=True) sets app.debug only after import.
+        enable_query_counter()  # Register the debug query counter before serving.
+    if not debug or os.environ.get("WERKZEUG_RUN_MAIN") == "true":  # Only in the process that serves requests (not the reloader parent).
+        start_forecast_worker()  # Midnight / on-demand forecast refresh.
+    app.run(host="0.0.0.0", debug=debug)  # Start Flask built-in server listening on all interfaces with debug enabled.
@@ -0,0 +1,35 @@
+# tests/support.py
+
+# Shared setup: import server.py against a throwaway SQLite database instead of MariaDB.
+import os
+import sys
+import tempfile
+
+BACKEND_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, BACKEND_DIR)
+
+import config
+
+DB_FILE = os.path.join(tempfile.mkdtemp(prefix="capstone-tests-"), "test.db")
+config.SQLALCHEMY_DATABASE_URI = f"sqlite:///{DB_FILE}"  # Must be set before server is imported
+
+import server
+from models import db
+
+server.app.config["TESTING"] = True
+
+
+def reset_database():
+    # Empty tables and caches so every test starts from the same state
+    with server.app.app_context():
+        db.drop_all()
+        db.create_all()
+    server.invalidate_sensor_caches()
+
+
+def logged_in_client():
+    # Test client with a session that passes login_required / api_login_required
+    client = server.app.test_client()
+    with client.session_transaction() as sess:
+        sess["user_id"] = 1
+    return client
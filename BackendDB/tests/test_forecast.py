@@ -0,0 +1,41 @@
+# tests/test_forecast.py
+
+import math
+import unittest
+
+from tests.support import logged_in_client, reset_database, server
+
+
+class ForecastTest(unittest.TestCase):
+    def setUp(self):
+        reset_database()
+        server.forecast_cache.update(voltage=None, current=None, best_voltage_value=None, best_current_value=None)
+        self.client = logged_in_client()
+
+    def post_logs(self, logs):
+        response = self.client.post("/api/v1/add-logs", json=logs)
+        self.assertEqual(response.status_code, 201, response.get_json())
+
+    def test_steps_only_log_keeps_forecast_finite(self):
+        # Six months of full readings (enough for the monthly forecast), then a steps-only day
+        self.post_logs([
+            {"datetime": f"2025-{month:02d}-{day:02d}T08:00:00", "steps": 10, "raw_voltage": 3.0 + day / 10, "raw_current": 1.0 + day / 10}
+            for month in range(1, 7) for day in (1, 2, 3)
+        ])
+        self.post_logs([{"datetime": "2025-07-01T08:00:00", "steps": 25}])
+
+        with server.app.app_context():
+            server.update_forecast_cache()
+
+        for key in ("voltage", "current", "best_voltage_value", "best_current_value"):
+            value = server.forecast_cache[key]
+            self.assertIsNotNone(value, key)
+            self.assertTrue(math.isfinite(value), f"{key} = {value}")
+
+        data = self.client.get("/api/v1/forecast").get_json()
+        self.assertIsNotNone(data["forecast_voltage"])
+        self.assertIsNotNone(data["forecast_current"])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,47 @@
+# tests/test_routing.py
+
+import os
+import tempfile
+import unittest
+from datetime import date
+
+from flask import Flask
+from sqlalchemy import insert, lambda_stmt, select
+
+from tests.support import server  # noqa: F401  (puts BackendDB on sys.path)
+from models import db, DailySummary
+
+
+class ReplicaRoutingTest(unittest.TestCase):
+    def setUp(self):
+        tmp = tempfile.mkdtemp(prefix="capstone-routing-")
+        self.app = Flask(__name__)
+        self.app.config["SQLALCHEMY_DATABASE_URI"] = f"sqlite:///{os.path.join(tmp, 'primary.db')}"
+        self.app.config["SQLALCHEMY_BINDS"] = {"replica": f"sqlite:///{os.path.join(tmp, 'replica.db')}"}
+        db.init_app(self.app)
+        self.ctx = self.app.app_context()
+        self.ctx.push()
+        self.primary, self.replica = db.engines[None], db.engines["replica"]
+
+    def tearDown(self):
+        db.session.remove()
+        self.ctx.pop()
+
+    def test_lambda_select_reads_from_replica(self):
+        session = db.session()
+        stmt = lambda_stmt(lambda: select(DailySummary.date))
+        stmt += lambda s: s.order_by(DailySummary.date)  # LinkedLambdaElement, as in get_chart_query
+        self.assertIs(session.get_bind(clause=stmt), self.replica)
+        self.assertIs(session.get_bind(clause=select(DailySummary.date)), self.replica)  # Not pinned by the lambda
+
+    def test_reads_after_a_write_stay_on_primary(self):
+        db.create_all()  # Tables on the primary only
+        session = db.session()
+        session.execute(insert(DailySummary).values(date=date(2025, 1, 1)))
+        self.assertIs(session.get_bind(clause=select(DailySummary.date)), self.primary)  # Sees its own write
+        session.rollback()
+        self.assertIs(session.get_bind(clause=select(DailySummary.date)), self.replica)
+
+
+if __name__ == "__main__":
+    unittest.main()
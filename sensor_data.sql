@@ -29,7 +29,7 @@ SET time_zone = "+00:00";
 
 CREATE TABLE `sensor_data` (
   `id` int(11) NOT NULL,
-  `steps` int(11) DEFAULT NULL,
+  `steps` smallint(5) UNSIGNED DEFAULT NULL,
   `datetime` datetime DEFAULT NULL,
   `raw_voltage` float DEFAULT NULL,
   `raw_current` float DEFAULT NULL,
@@ -107,7 +107,8 @@ INSERT INTO `sensor_data` (`id`, `steps`, `datetime`, `raw_voltage`, `raw_curren
 -- Indexes for table `sensor_data`
 --
 ALTER TABLE `sensor_data`
-  ADD PRIMARY KEY (`id`);
+  ADD PRIMARY KEY (`id`),
+  ADD KEY `ix_sensor_datetime_id_battery` (`datetime`,`id`,`battery_health`);
 
 --
 -- AUTO_INCREMENT for dumped tables